@@ -0,0 +1,119 @@
+# shared micro-benchmark harness for the lab benchmark drivers
+#
+# usage from any lab:
+#   timing = measure(sort_func, setup=lambda: (data.copy(),))
+#   timing.median, timing.iqr, timing.min
+import gc
+import os
+import statistics
+import time
+
+
+class Timing:
+    def __init__(self, samples: list[float], number: int):
+        # seconds per single call, one entry per repetition
+        self.samples = samples
+        self.number = number
+
+        ordered = sorted(samples)
+        self.min = ordered[0]
+        self.max = ordered[-1]
+        self.median = statistics.median(ordered)
+        self.mean = statistics.fmean(ordered)
+
+        if len(ordered) >= 2:
+            self.q1, _, self.q3 = statistics.quantiles(ordered, n=4, method="inclusive")
+        else:
+            self.q1 = self.q3 = ordered[0]
+        self.iqr = self.q3 - self.q1
+
+        # tukey fences
+        low, high = self.q1 - 1.5 * self.iqr, self.q3 + 1.5 * self.iqr
+        self.outliers = [s for s in samples if s < low or s > high]
+
+    def __repr__(self):
+        return (f"Timing(median={self.median:.3e}s, iqr={self.iqr:.3e}s, min={self.min:.3e}s, "
+                f"repeat={len(self.samples)}, number={self.number}, outliers={len(self.outliers)})")
+
+
+def _pin(cpu):
+    if cpu is None or not hasattr(os, "sched_setaffinity"):
+        return None
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, {cpu})
+    return previous
+
+
+def _unpin(previous):
+    if previous is not None:
+        os.sched_setaffinity(0, previous)
+
+
+def _run(func, args, setup, number):
+    if setup is not None:
+        # fresh arguments for every call, built outside the timed region
+        args = setup()
+        start = time.perf_counter_ns()
+        func(*args)
+        return time.perf_counter_ns() - start
+
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        func(*args)
+    return time.perf_counter_ns() - start
+
+
+# the loop count never goes past this, even when a first sample reads as near zero
+MAX_NUMBER = 1 << 20
+
+
+def _autoscale(func, args, sample_time):
+    # grow the loop count until one sample lasts long enough to drown the clock resolution,
+    # the last run is already a valid sample and is handed back with the count
+    number = 1
+    while True:
+        elapsed = _run(func, args, None, number) / 1e9
+        if elapsed >= sample_time or number >= MAX_NUMBER:
+            return number, elapsed
+        # clamped before the next run, the estimate explodes when elapsed is near zero
+        number = min(max(number * 2, int(number * sample_time / max(elapsed, 1e-9))), MAX_NUMBER)
+
+
+def measure(func, *args, setup=None, target_time=0.5, min_repeat=3, max_repeat=1000,
+            warmup=1, disable_gc=True, pin_cpu=None) -> Timing:
+    """Time func(*args), or func(*setup()) when the call mutates its input.
+
+    Repeats until target_time seconds are spent (at least min_repeat times),
+    with warmup untimed calls first. With setup every sample is a single call.
+    """
+    previous_affinity = _pin(pin_cpu)
+    gc_was_enabled = gc.isenabled()
+
+    try:
+        for _ in range(warmup):
+            func(*(setup() if setup is not None else args))
+
+        if disable_gc:
+            gc.collect()
+            gc.disable()
+
+        samples = []
+        spent = 0.0
+
+        if setup is not None:
+            number = 1
+        else:
+            number, elapsed = _autoscale(func, args, target_time / 20)
+            samples.append(elapsed / number)
+            spent += elapsed
+
+        while len(samples) < max_repeat and (len(samples) < min_repeat or spent < target_time):
+            elapsed = _run(func, args, setup, number) / 1e9
+            samples.append(elapsed / number)
+            spent += elapsed
+
+        return Timing(samples, number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        _unpin(previous_affinity)
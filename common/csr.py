@@ -0,0 +1,142 @@
+# compressed sparse row graph shared by the graph algorithms of lab3, lab4 and lab5
+#
+# the neighbours of node id u are indices[indptr[u]:indptr[u + 1]] with the matching
+# weights, ids are int32 and the buffers are array.array so a slice iterates straight
+# into Python ints, as_numpy gives numpy views of the same memory for vectorised work
+#
+# every algorithm checks getattr(graph, "is_csr", False) and otherwise treats the
+# graph as an nx.Graph, results are always keyed by the node labels
+import array
+
+import numpy as np
+
+
+class CSRGraph:
+    is_csr = True
+
+    def __init__(self, indptr, indices, weights, labels=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        # None means the ids are the labels, a range costs no memory
+        if labels is None:
+            labels = range(len(indptr) - 1)
+        self.labels = labels if isinstance(labels, range) else list(labels)
+        self._index = None
+
+    def __repr__(self):
+        return f"CSRGraph(nodes={self.number_of_nodes()}, edges={self.number_of_edges()})"
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    ### construction
+
+    @classmethod
+    def from_edges(cls, u, v, weights, num_nodes: int, labels=None) -> "CSRGraph":
+        # undirected edges given once each as (u[i], v[i], weights[i]) over ids 0..num_nodes - 1
+        u, v, weights = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64), np.asarray(weights)
+        # edge i gives the entries u[i] -> v[i] and v[i] -> u[i] next to each other, and the
+        # stable sort keeps every node's neighbours in edge order, the order networkx keeps
+        src = np.stack([u, v], axis=1).ravel()
+        dst = np.stack([v, u], axis=1).ravel()
+        both = np.repeat(weights, 2)
+
+        order = np.argsort(src, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_nodes), out=indptr[1:])
+        return cls(
+            _buffer(indptr, "q"),
+            _buffer(dst[order], "i"),
+            _buffer(both[order], "q" if np.issubdtype(both.dtype, np.integer) else "d"),
+            labels,
+        )
+
+    @classmethod
+    def from_networkx(cls, G, weight: str = "weight", default=1) -> "CSRGraph":
+        labels = list(G.nodes)
+        index = {label: i for i, label in enumerate(labels)}
+
+        indptr = array.array("q", [0])
+        indices = array.array("i")
+        values = []
+        for label in labels:
+            for neighbor, data in G.adj[label].items():
+                indices.append(index[neighbor])
+                values.append(data.get(weight, default))
+            indptr.append(len(indices))
+
+        graph = cls(indptr, indices, _weight_buffer(values), labels)
+        graph._index = index
+        return graph
+
+    @classmethod
+    def from_adjacency_list(cls, adjacency_list: dict) -> "CSRGraph":
+        # the {vertex: [(neighbor, weight), ...]} of Graph.to_adjacency_list, both directions listed
+        labels = list(adjacency_list)
+        index = {label: i for i, label in enumerate(labels)}
+
+        indptr = array.array("q", [0])
+        indices = array.array("i")
+        values = []
+        for label in labels:
+            for neighbor, weight in adjacency_list[label]:
+                indices.append(index[neighbor])
+                values.append(weight)
+            indptr.append(len(indices))
+
+        graph = cls(indptr, indices, _weight_buffer(values), labels)
+        graph._index = index
+        return graph
+
+    ### queries
+
+    def number_of_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    def number_of_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def id_of(self, label) -> int:
+        if isinstance(self.labels, range):
+            return label
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index[label]
+
+    def label_of(self, node_id: int):
+        return self.labels[node_id]
+
+    def neighbors(self, node_id: int):
+        return self.indices[self.indptr[node_id]:self.indptr[node_id + 1]]
+
+    def edge_weights(self, node_id: int):
+        return self.weights[self.indptr[node_id]:self.indptr[node_id + 1]]
+
+    def as_numpy(self):
+        # indptr, indices, weights as numpy views of the same buffers
+        return (
+            np.frombuffer(self.indptr, dtype=np.int64),
+            np.frombuffer(self.indices, dtype=np.int32),
+            np.frombuffer(self.weights, dtype=np.int64 if self.weights.typecode == "q" else np.float64),
+        )
+
+    def edge_arrays(self):
+        # (u, v, weight) with every undirected edge once, u < v
+        indptr, indices, weights = self.as_numpy()
+        src = np.repeat(np.arange(self.number_of_nodes(), dtype=np.int32), np.diff(indptr))
+        once = src < indices
+        return src[once], indices[once], weights[once]
+
+    def nbytes(self) -> int:
+        return sum(buf.itemsize * len(buf) for buf in (self.indptr, self.indices, self.weights))
+
+
+def _buffer(values: np.ndarray, typecode: str) -> array.array:
+    buf = array.array(typecode)
+    buf.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+    return buf
+
+
+def _weight_buffer(values: list) -> array.array:
+    return array.array("q" if all(isinstance(w, int) for w in values) else "d", values)
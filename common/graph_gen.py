@@ -0,0 +1,113 @@
+# random connected weighted graphs for the graph labs (lab3, lab4, lab5)
+#
+# the spanning tree comes from a random Prüfer sequence, which is uniform over all
+# labelled trees and decodes in O(n), the extra edges are drawn as integer pair codes
+# u * n + v and rejected when they repeat, and every weight comes from one numpy draw
+import random
+
+import networkx as nx
+import numpy as np
+
+# extra edges are drawn in batches this much larger than what is still missing
+OVERSAMPLE = 1.25
+
+
+def _rng(seed):
+    # without a seed the draw still follows random.seed, like the generator it replaces
+    return np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+
+
+def random_tree_edges(num_nodes: int, rng) -> tuple[np.ndarray, np.ndarray]:
+    if num_nodes < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    prufer = rng.integers(0, num_nodes, num_nodes - 2).tolist()
+    degree = (np.bincount(prufer, minlength=num_nodes) + 1).tolist()
+
+    # linear decoding, ptr only moves forward and the leaf is either ptr or a node below it
+    u = [0] * (num_nodes - 1)
+    v = [0] * (num_nodes - 1)
+    ptr = degree.index(1)
+    leaf = ptr
+    for i, node in enumerate(prufer):
+        u[i], v[i] = leaf, node
+        degree[node] -= 1
+        if degree[node] == 1 and node < ptr:
+            leaf = node
+        else:
+            ptr += 1
+            while degree[ptr] != 1:
+                ptr += 1
+            leaf = ptr
+    u[-1], v[-1] = leaf, num_nodes - 1
+
+    return np.array(u, dtype=np.int64), np.array(v, dtype=np.int64)
+
+
+def _pair_codes(u, v, num_nodes):
+    return np.minimum(u, v) * num_nodes + np.maximum(u, v)
+
+
+def random_extra_edges(num_nodes: int, taken: np.ndarray, count: int, rng) -> np.ndarray:
+    # count pair codes that are neither in taken nor repeated, in the order they were drawn
+    if count <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    available = num_nodes * (num_nodes - 1) // 2 - len(taken)
+    if count > available // 2:
+        # dense graph, rejection would keep hitting taken pairs, so sample the complement
+        upper, lower = np.triu_indices(num_nodes, 1)
+        codes = upper * num_nodes + lower
+        codes = codes[~np.isin(codes, taken)]
+        return rng.choice(codes, count, replace=False)
+
+    taken = np.sort(taken)
+    chosen = np.empty(0, dtype=np.int64)
+    while len(chosen) < count:
+        batch = int((count - len(chosen)) * OVERSAMPLE) + 16
+        a = rng.integers(0, num_nodes, batch)
+        b = rng.integers(0, num_nodes, batch)
+        keep = a != b
+        codes = np.concatenate([chosen, _pair_codes(a[keep], b[keep], num_nodes)])
+
+        # first occurrence of every code, kept in draw order so the result stays random
+        _, first = np.unique(codes, return_index=True)
+        codes = codes[np.sort(first)]
+        position = np.searchsorted(taken, codes)
+        position[position == len(taken)] = 0
+        chosen = codes[taken[position] != codes] if len(taken) else codes
+
+    return chosen[:count]
+
+
+def random_connected_edges(num_nodes: int, num_edges: int, weight_range=(1, 10), seed=None):
+    # (u, v, weight) arrays of a connected graph over the integer ids 0..num_nodes - 1
+    if num_edges < num_nodes - 1:
+        raise ValueError("Number of edges must be at least (num_nodes - 1) for connectivity.")
+    if num_edges > num_nodes * (num_nodes - 1) // 2:
+        raise ValueError("Too many edges for the number of nodes.")
+
+    rng = _rng(seed)
+    tree_u, tree_v = random_tree_edges(num_nodes, rng)
+    tree_codes = _pair_codes(tree_u, tree_v, num_nodes)
+    extra = random_extra_edges(num_nodes, tree_codes, num_edges - len(tree_codes), rng)
+
+    u = np.concatenate([tree_u, extra // num_nodes])
+    v = np.concatenate([tree_v, extra % num_nodes])
+    weights = rng.integers(weight_range[0], weight_range[1], len(u), endpoint=True)
+    return u, v, weights
+
+
+def generate_connected_weighted_graph(num_nodes: int, num_edges: int, weight_range=(1, 10), seed=None) -> nx.Graph:
+    """Generate a connected weighted graph with nodes 'v1'..'vN' and integer weights."""
+    u, v, weights = random_connected_edges(num_nodes, num_edges, weight_range, seed)
+
+    # the labels are made once here instead of relabelling a finished graph,
+    # at 10^6 nodes filling the networkx dicts takes far longer than drawing the edges
+    labels = [f"v{i + 1}" for i in range(num_nodes)]
+    G = nx.Graph()
+    G.add_nodes_from(labels)
+    G.add_weighted_edges_from(zip(
+        map(labels.__getitem__, u.tolist()), map(labels.__getitem__, v.tolist()), weights.tolist()
+    ))
+    return G
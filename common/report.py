@@ -0,0 +1,299 @@
+# report stage, renders the charts of every lab from the stored benchmark results
+#
+#   python -m common.report                 latest run of every lab
+#   python -m common.report --lab lab5      latest run of one lab
+#   python -m common.report --run <run id>  one specific run
+#
+# matplotlib is only imported here, and always with the Agg backend, so the
+# timing runs never pay for it and nothing tries to open a window
+import argparse
+import os
+import re
+import sys
+from itertools import cycle
+
+from common.results import DEFAULT_STORE, ResultStore
+
+COLORS = ["#eb9191", "#91ebcf", "#919eeb"]
+
+
+def pyplot():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _series(records, algorithm, family=None, x="size"):
+    points = sorted(
+        (record[x], record["median"]) for record in records
+        if record["algorithm"] == algorithm and (family is None or record["family"] == family)
+    )
+    return [p[0] for p in points], [p[1] for p in points]
+
+
+def _algorithms(records):
+    return list(dict.fromkeys(record["algorithm"] for record in records))
+
+
+def _families(records, algorithm=None):
+    return list(dict.fromkeys(
+        record["family"] for record in records if algorithm is None or record["algorithm"] == algorithm
+    ))
+
+
+def _slug(name):
+    # a file name part from an algorithm name, FibRec('memo', maxsize=1024) -> fibrec_memo_maxsize_1024
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+### one renderer per lab, each returns the paths it wrote
+
+def render_lab1(records, out_dir):
+    plt = pyplot()
+    written = []
+
+    for algorithm in _algorithms(records):
+        families = _families(records, algorithm)
+
+        fig, ax = plt.subplots()
+        ax.set_title(algorithm, weight="bold")
+        ax.set_xlabel("$f_n$")
+        ax.set_ylabel("T(s)")
+        ax.grid()
+        ax.set_facecolor("#424c51")
+        # one line per family, the same method is timed by several lab1 experiments
+        for i, family in enumerate(families):
+            datapoints, times = _series(records, algorithm, family)
+            ax.plot(datapoints, times, marker="o", color=COLORS[i % len(COLORS)], label=family)
+        if len(families) > 1:
+            ax.legend()
+        sizes = sorted(record["size"] for record in records if record["algorithm"] == algorithm)
+        if len(sizes) > 1 and sizes[-1] / max(sizes[0], 1) > 50:
+            ax.set_xscale("log")
+
+        path = os.path.join(out_dir, f"lab1_{_slug(algorithm)}.png")
+        fig.savefig(path)
+        plt.close(fig)
+        written.append(path)
+
+    written.append(render_fib_diff(out_dir))
+    return written
+
+
+def render_fib_diff(out_dir, datapoints=range(0, 82)):
+    # no timings involved, the error of the phi approximation is computed here from lab1's code
+    lab1_code = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab1", "code")
+    if lab1_code not in sys.path:
+        sys.path.insert(0, lab1_code)
+    from fib_range import phi_differences
+
+    datapoints, differences = phi_differences(datapoints)
+
+    plt = pyplot()
+    fig, ax = plt.subplots()
+    ax.plot(datapoints, differences, color="#eb9191")
+    ax.set_title("Difference Between Actual Fibonacci and Phi Approximation", weight="bold")
+    ax.set_xlabel("Fibonacci Index")
+    ax.set_ylabel("Difference")
+    ax.grid()
+
+    path = os.path.join(out_dir, "diff_phi.png")
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def render_lab2(records, out_dir):
+    plt = pyplot()
+    written = []
+
+    for algorithm in _algorithms(records):
+        array_types = _families(records, algorithm)
+        sample_sizes = sorted({r["size"] for r in records if r["algorithm"] == algorithm})
+
+        fig, ax = plt.subplots(figsize=(12, 6))
+        diffs = [b - a for a, b in zip(sample_sizes, sample_sizes[1:])]
+        # the bars of all families share three quarters of the gap between two sizes
+        bar_width = (min(diffs) if diffs else sample_sizes[0]) * 0.75 / len(array_types)
+
+        for i, array_type in enumerate(array_types):
+            sizes, times = _series(records, algorithm, array_type)
+            offset = (i - (len(array_types) - 1) / 2) * bar_width
+            rects = ax.bar(
+                [x + offset for x in sizes],
+                times,
+                bar_width,
+                label=f'{array_type.replace("_", " ").title()} Array',
+                color=COLORS[i % len(COLORS)]
+            )
+            for rect in rects:
+                height = rect.get_height()
+                ax.annotate(
+                    f'{height:.4f}',
+                    xy=(rect.get_x() + rect.get_width() / 2, height),
+                    xytext=(0, 3),
+                    textcoords="offset points",
+                    ha='center', va='bottom',
+                    color='white', fontsize=8
+                )
+
+        title = f"{algorithm.replace('_', ' ').title()} Performance by Array Type and Size"
+        ax.set_xlabel('Array Size', fontweight='bold')
+        ax.set_ylabel('Execution Time (seconds)', fontweight='bold')
+        ax.set_title(title, fontweight='bold')
+        ax.set_xticks(sample_sizes)
+        ax.set_xticklabels([f"{size:,}" for size in sample_sizes])
+
+        if max(sample_sizes) / min(sample_sizes) > 50:
+            ax.set_xscale('log')
+            ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{int(x):,}"))
+
+        ax.legend()
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.set_facecolor("#424c51")
+        fig.patch.set_facecolor('white')
+        fig.tight_layout()
+
+        image_dir = os.path.join(out_dir, "images", "lab")
+        os.makedirs(image_dir, exist_ok=True)
+        path = os.path.join(image_dir, f"{algorithm}.png")
+        fig.savefig(path)
+        plt.close(fig)
+        written.append(path)
+
+    return written
+
+
+def render_lab3(records, out_dir):
+    plt = pyplot()
+
+    fig, ax = plt.subplots()
+    for algorithm, marker in zip(_algorithms(records), cycle("os^vD*")):
+        nodes, times = _series(records, algorithm)
+        ax.plot(nodes, times, label=algorithm.upper().replace("_", " "), marker=marker)
+    if any(record["size"] >= 10**4 for record in records):
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+
+    ax.set_xlabel("Number of Nodes")
+    ax.set_ylabel("Time (s)")
+    ax.set_title("DFS vs BFS Traversal Time, nx.Graph and CSR")
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+
+    path = os.path.join(out_dir, "traversal_benchmark.png")
+    fig.savefig(path, dpi=300)
+    plt.close(fig)
+    return [path]
+
+
+def render_lab4(records, out_dir):
+    plt = pyplot()
+    titles = {"dijkstra": "Dijkstra", "floyd_warshall": "Floyd-Warshall"}
+    files = {"dijkstra": "dijkstra_sparse_dense.png", "floyd_warshall": "floyd_sparse_dense.png"}
+    written = []
+
+    for algorithm in _algorithms(records):
+        fig, ax = plt.subplots(figsize=(10, 5))
+        for family, marker in zip(_families(records, algorithm), "os^v"):
+            nodes, times = _series(records, algorithm, family)
+            ax.plot(nodes, times, marker=marker, label=family.title())
+
+        name = titles.get(algorithm, algorithm)
+        ax.set_title(f"{name}: Sparse vs Dense Graphs")
+        ax.set_xlabel("Number of Nodes")
+        ax.set_ylabel("Time (s)")
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+
+        path = os.path.join(out_dir, files.get(algorithm, f"{algorithm}_sparse_dense.png"))
+        fig.savefig(path, dpi=300)
+        plt.close(fig)
+        written.append(path)
+
+    return written
+
+
+def render_lab5(records, out_dir):
+    plt = pyplot()
+    fig, axs = plt.subplots(2, 2, figsize=(12, 10))
+
+    scenario2 = [r for r in records if r["family"] == "scenario2"]
+    fixed_nodes = scenario2[0]["size"] if scenario2 else "?"
+    panels = [
+        (axs[0, 0], "scenario1", "size", "Edge Density (edges = nodes * 1.5)", "Vertices"),
+        (axs[0, 1], "scenario2", "edges", f"Fixed Vertices (n = {fixed_nodes})", "Edges"),
+        (axs[1, 0], "scenario3", "size", "Dense Graphs (edges = nodes * 2)", "Vertices"),
+        (axs[1, 1], "scenario4", "size", "Sparse Graphs (edges = nodes)", "Vertices"),
+    ]
+
+    for ax, family, x, title, xlabel in panels:
+        for algorithm, marker in zip(_algorithms(records), "os^v"):
+            xs, times = _series(records, algorithm, family, x)
+            ax.plot(xs, times, label=algorithm.title(), marker=marker)
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel("Time (s)")
+        ax.legend()
+        ax.grid(True)
+
+    fig.tight_layout()
+    path = os.path.join(out_dir, "algorithm_performance_optimized.png")
+    fig.savefig(path, dpi=300)
+    plt.close(fig)
+    return [path]
+
+
+RENDERERS = {
+    "lab1": render_lab1,
+    "lab2": render_lab2,
+    "lab3": render_lab3,
+    "lab4": render_lab4,
+    "lab5": render_lab5,
+}
+
+
+def render_run(store: ResultStore, run_id: str, out_dir: str = ".") -> list[str]:
+    records = store.records(run_id)
+    if not records:
+        return []
+
+    lab = records[0]["lab"]
+    renderer = RENDERERS.get(lab)
+    if renderer is None:
+        return []
+
+    os.makedirs(out_dir, exist_ok=True)
+    return renderer(records, out_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render benchmark charts from stored results.")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    parser.add_argument("--run", help="render one specific run")
+    parser.add_argument("--lab", choices=sorted(RENDERERS), help="render the latest run of one lab")
+    parser.add_argument("--out", default=".", help="directory for the images")
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.store)
+    if args.run:
+        run_ids = [args.run]
+    else:
+        labs = [args.lab] if args.lab else sorted(RENDERERS)
+        run_ids = [run_id for run_id in (store.latest_run(lab) for lab in labs) if run_id]
+
+    if not run_ids:
+        print("nothing to render, the store has no matching runs")
+        return 1
+
+    for run_id in run_ids:
+        for path in render_run(store, run_id, args.out):
+            print(f"{run_id}: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
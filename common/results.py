@@ -0,0 +1,257 @@
+# persistent benchmark results, one JSON record per line
+#
+# every lab driver appends to the same store, and two runs can be compared with
+#   python -m common.results list
+#   python -m common.results diff <baseline run> <candidate run>
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+
+DEFAULT_STORE = os.environ.get(
+    "AA_RESULTS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "results", "benchmarks.jsonl"),
+)
+
+
+def machine_fingerprint() -> dict:
+    info = {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "cpus": os.cpu_count(),
+    }
+    info["id"] = hashlib.sha1(json.dumps(info, sort_keys=True).encode()).hexdigest()[:12]
+    return info
+
+
+class Run:
+    def __init__(self, store, lab: str, label: str = None):
+        self.store = store
+        self.lab = lab
+        self.label = label
+        self.run_id = time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        self.machine = machine_fingerprint()
+        self._keys = set()
+
+    def record(self, algorithm: str, family: str, size: int, samples, seed: int = None, **extra):
+        # samples is a Timing from common.benchmark or a plain list of seconds
+        samples = list(getattr(samples, "samples", samples))
+        record = {
+            "run_id": self.run_id,
+            "label": self.label,
+            "lab": self.lab,
+            "algorithm": algorithm,
+            "family": family,
+            "size": int(size),
+            "seed": seed,
+            "machine": self.machine,
+            "timestamp": time.time(),
+            "samples": [float(s) for s in samples],
+            "median": statistics.median(samples),
+            "min": min(samples),
+        }
+        record.update(extra)
+
+        # diff pairs records by key, a second record under the same key would hide the first
+        key = _key(record)
+        if key in self._keys:
+            raise ValueError(f"{key} was already recorded in run {self.run_id}, give the records distinct families.")
+        self._keys.add(key)
+
+        self.store.append(record)
+        return record
+
+
+class ResultStore:
+    def __init__(self, path: str = DEFAULT_STORE):
+        self.path = path
+
+    def start_run(self, lab: str, label: str = None) -> Run:
+        return Run(self, lab, label)
+
+    def append(self, record: dict):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def records(self, run_id: str = None, lab: str = None) -> list[dict]:
+        if not os.path.exists(self.path):
+            return []
+
+        found = []
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if run_id is not None and record["run_id"] != run_id:
+                    continue
+                if lab is not None and record["lab"] != lab:
+                    continue
+                found.append(record)
+        return found
+
+    def runs(self) -> list[dict]:
+        runs = {}
+        for record in self.records():
+            run = runs.setdefault(record["run_id"], {
+                "run_id": record["run_id"],
+                "label": record.get("label"),
+                "lab": record["lab"],
+                "machine": record["machine"]["id"],
+                "started": record["timestamp"],
+                "records": 0,
+            })
+            run["records"] += 1
+        return sorted(runs.values(), key=lambda run: run["started"])
+
+    def latest_run(self, lab: str = None) -> str:
+        runs = [run for run in self.runs() if lab is None or run["lab"] == lab]
+        return runs[-1]["run_id"] if runs else None
+
+
+### comparison
+
+def mann_whitney_u(a: list[float], b: list[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test, normal approximation with tie correction."""
+    n1, n2 = len(a), len(b)
+    if n1 < 2 or n2 < 2:
+        return 1.0
+
+    values = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    ranks = [0.0] * len(values)
+    tie_term = 0
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return math.erfc(max(z, 0) / math.sqrt(2))
+
+
+def smallest_p(n1: int, n2: int) -> float:
+    """The p-value of two completely separated samples, no pair of these sizes can go lower."""
+    return mann_whitney_u(list(range(n1)), list(range(n1, n1 + n2)))
+
+
+def _key(record):
+    # scenarios that vary the edge count at a fixed size keep it in the record
+    return (record["lab"], record["algorithm"], record["family"], record["size"], record.get("edges"))
+
+
+def diff_runs(baseline: list[dict], candidate: list[dict], alpha: float = 0.05, threshold: float = 0.05) -> list[dict]:
+    """Pair the records of two runs and flag the significant slowdowns."""
+    base = {_key(record): record for record in baseline}
+
+    rows = []
+    for record in candidate:
+        old = base.get(_key(record))
+        if old is None:
+            continue
+
+        ratio = record["median"] / old["median"] if old["median"] else math.inf
+        p = mann_whitney_u(old["samples"], record["samples"])
+        # with too few samples even a total separation stays above alpha, say so instead of "no change"
+        testable = smallest_p(len(old["samples"]), len(record["samples"])) < alpha
+        rows.append({
+            "lab": record["lab"],
+            "algorithm": record["algorithm"],
+            "family": record["family"],
+            "size": record["size"],
+            "baseline": old["median"],
+            "candidate": record["median"],
+            "ratio": ratio,
+            "p": p,
+            "testable": testable,
+            "regression": p < alpha and ratio > 1 + threshold,
+            "improvement": p < alpha and ratio < 1 - threshold,
+        })
+    return rows
+
+
+def _print_rows(rows):
+    header = f"{'Lab':<6}{'Algorithm':<28}{'Family':<20}{'Size':>10}{'Baseline':>13}{'Candidate':>13}{'Ratio':>8}{'p':>9}  "
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        flag = ("SLOWER" if row["regression"] else "faster" if row["improvement"]
+                else "" if row["testable"] else "too few samples")
+        print(f"{row['lab']:<6}{row['algorithm']:<28}{row['family']:<20}{row['size']:>10}"
+              f"{row['baseline']:>13.6f}{row['candidate']:>13.6f}{row['ratio']:>8.3f}{row['p']:>9.4f}  {flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and compare stored benchmark runs.")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list the stored runs")
+
+    diff = commands.add_parser("diff", help="compare two runs and flag significant slowdowns")
+    diff.add_argument("baseline")
+    diff.add_argument("candidate", nargs="?", help="defaults to the latest run of the same lab")
+    diff.add_argument("--alpha", type=float, default=0.05, help="significance level")
+    diff.add_argument("--threshold", type=float, default=0.05, help="relative slowdown to ignore")
+
+    args = parser.parse_args(argv)
+    store = ResultStore(args.store)
+
+    if args.command == "list":
+        for run in store.runs():
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started"]))
+            print(f"{run['run_id']}  {run['lab']:<6}{started}  machine={run['machine']}  "
+                  f"records={run['records']}  {run['label'] or ''}")
+        return 0
+
+    baseline = store.records(args.baseline)
+    if not baseline:
+        parser.error(f"no records for run {args.baseline}")
+
+    candidate_id = args.candidate or store.latest_run(baseline[0]["lab"])
+    candidate = store.records(candidate_id)
+    if not candidate:
+        parser.error(f"no records for run {candidate_id}")
+
+    if baseline[0]["machine"]["id"] != candidate[0]["machine"]["id"]:
+        print("warning: the runs come from different machines, timings may not be comparable\n")
+
+    rows = diff_runs(baseline, candidate, args.alpha, args.threshold)
+    _print_rows(rows)
+
+    regressions = sum(row["regression"] for row in rows)
+    print(f"\n{len(rows)} comparisons, {regressions} significant slowdowns")
+    untestable = sum(not row["testable"] for row in rows)
+    if untestable:
+        print(f"warning: {untestable} comparisons have too few samples to ever reach p < {args.alpha}, "
+              f"record more repetitions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
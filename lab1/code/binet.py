@@ -1,5 +1,21 @@
+from math import sqrt
+
+import phi_powers
+
+
 # using binet formula
 def fib_binet(n):
     phi = (1 + sqrt(5)) / 2
     psi = (1 - sqrt(5)) / 2
     return round((phi**n - psi**n) / sqrt(5))
+
+
+# binet formula with as many bits of phi as F(n) needs, exact for every n
+def fib_binet_exact(n):
+    if n < 2:
+        return n
+
+    # |psi^n / sqrt(5)| < 1/2, so F(n) is phi^n / sqrt(5) rounded
+    precision = phi_powers.precision_for(n)
+    value = phi_powers.multiply(phi_powers.phi_power(n, precision), phi_powers.inv_sqrt5(precision), precision)
+    return phi_powers.round_to_int(value)
@@ -1,19 +1,165 @@
+from collections import OrderedDict
+from contextlib import nullcontext
+from decimal import Context, Decimal, MAX_EMAX, MAX_PREC, localcontext
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# fastest big-integer type available at import, gmpy2 multiplies huge numbers much faster
+BACKEND = "gmpy2" if gmpy2 is not None else "int"
+
+# exact integer arithmetic through decimal, libmpdec switches to number theoretic
+# transform multiplication for very large operands
+_DECIMAL_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX)
+
+
 # seventh methood, using fast doubling formula
 def fib_fast_doubling(n):
     if n == 0:
         return 0
     elif n == 1:
         return 1
-    
+
     def fib_doubling(k):
         if k == 0:
             return (0, 1)
-        
+
         Fk, Fk1 = fib_doubling(k // 2)
 
         F2k = Fk * (2 * Fk1 - Fk)
-        F2k1 = Fk1**2 + Fk**2 
-        
+        F2k1 = Fk1**2 + Fk**2
+
         return (F2k1, F2k + F2k1) if k % 2 else (F2k, F2k1)
 
-    return fib_doubling(n)[0]
\ No newline at end of file
+    return fib_doubling(n)[0]
+
+
+### iterative variant, two squarings per bit
+
+# k -> (backend, F(k), F(k+1)), shared by every call so nearby queries reuse the work
+_checkpoints = OrderedDict()
+CHECKPOINT_CACHE_SIZE = 64
+
+# only the last few prefixes of n are worth keeping, the smaller ones are cheap to redo
+CHECKPOINT_DEPTH = 8
+
+# a checkpoint this close to n is shifted with the addition formula instead of doubling again
+CHECKPOINT_REACH = 1 << 16
+
+
+def _convert(x, backend):
+    if backend == "gmpy2":
+        return gmpy2.mpz(x)
+    elif backend == "decimal":
+        return Decimal(x)
+    return x
+
+
+def _small_fib_pair(d):
+    # (F(d-1), F(d)) for a small, possibly negative d, using F(-m) = (-1)^(m+1) F(m)
+    if d >= 0:
+        return fib_fast_doubling(d - 1) if d else 1, fib_fast_doubling(d)
+
+    m = -d
+    sign = 1 if m % 2 else -1
+    return -sign * fib_fast_doubling(m + 1), sign * fib_fast_doubling(m)
+
+
+def _lookup_checkpoint(n, backend):
+    nearest = None
+    for k, (stored_backend, _, _) in _checkpoints.items():
+        if stored_backend == backend and abs(n - k) <= CHECKPOINT_REACH:
+            if nearest is None or abs(n - k) < abs(n - nearest):
+                nearest = k
+    if nearest is not None:
+        _checkpoints.move_to_end(nearest)
+        return nearest, True
+
+    # the bit scan goes through every prefix n >> j, start from the longest cached one
+    for j in range(1, n.bit_length()):
+        k = n >> j
+        if k in _checkpoints and _checkpoints[k][0] == backend:
+            _checkpoints.move_to_end(k)
+            return k, False
+
+    return None, False
+
+
+def _store_checkpoint(k, backend, Fkm1, Fk):
+    _checkpoints[k] = (backend, Fk, Fkm1 + Fk)
+    _checkpoints.move_to_end(k)
+    while len(_checkpoints) > CHECKPOINT_CACHE_SIZE:
+        _checkpoints.popitem(last=False)
+
+
+def clear_checkpoints():
+    _checkpoints.clear()
+
+
+# the decimal backend returns an exact integral Decimal, int() on it is quadratic in CPython
+def fib_fast_doubling_it(n, backend=None, use_cache=True):
+    if n < 0:
+        raise ValueError("n must be non-negative.")
+
+    backend = backend or BACKEND
+    if backend not in ("int", "gmpy2", "decimal"):
+        raise ValueError(f"Unknown backend '{backend}'.")
+    if backend == "gmpy2" and gmpy2 is None:
+        raise ValueError("gmpy2 is not installed.")
+
+    if n < 2:
+        return _convert(n, backend) if backend == "decimal" else n
+
+    context = localcontext(_DECIMAL_CONTEXT) if backend == "decimal" else nullcontext()
+    with context:
+        k, shift = _lookup_checkpoint(n, backend) if use_cache else (None, False)
+
+        if k is None:
+            # (F(k-1), F(k)) for k = 1
+            k = 1
+            a, b = _convert(0, backend), _convert(1, backend)
+        else:
+            _, Fk, Fk1 = _checkpoints[k]
+            a, b = Fk1 - Fk, Fk
+
+        if shift:
+            # F(k+d) = F(k)F(d+1) + F(k-1)F(d), only one huge operand per product
+            d = n - k
+            Fdm1, Fd = _small_fib_pair(d)
+            a, b = b * Fd + a * Fdm1, b * (Fd + Fdm1) + a * Fd
+            k = n
+        elif k != n:
+            a, b = _doubling_steps(n, k, a, b, backend, use_cache)
+
+        if use_cache and shift:
+            _store_checkpoint(n, backend, a, b)
+
+    return b if backend == "decimal" else int(b)
+
+
+def _doubling_steps(n, k, a, b, backend, use_cache):
+    bits = n.bit_length() - k.bit_length()
+    for j in range(bits - 1, -1, -1):
+        # F(2k+1) = 4F(k)^2 - F(k-1)^2 + 2(-1)^k
+        # F(2k-1) = F(k)^2 + F(k-1)^2
+        # F(2k)   = F(2k+1) - F(2k-1)
+        sq_k = b * b
+        sq_km1 = a * a
+
+        F2km1 = sq_k + sq_km1
+        F2kp1 = 4 * sq_k - sq_km1 + (-2 if k & 1 else 2)
+        F2k = F2kp1 - F2km1
+
+        if (n >> j) & 1:
+            k = 2 * k + 1
+            a, b = F2k, F2kp1
+        else:
+            k = 2 * k
+            a, b = F2km1, F2k
+
+        if use_cache and j < CHECKPOINT_DEPTH:
+            _store_checkpoint(k, backend, a, b)
+
+    return a, b
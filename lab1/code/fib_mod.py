@@ -0,0 +1,149 @@
+# F(n) mod m without ever building the full F(n)
+from collections import defaultdict
+from math import isqrt, lcm
+
+
+def _fib_pair_mod(n, m):
+    # (F(n), F(n+1)) mod m, fast doubling over the bits of n
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * ((2 * b - a) % m) % m
+        d = (a * a + b * b) % m
+        if bit == "1":
+            a, b = d, (c + d) % m
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fib_mod(n, m):
+    if n < 0:
+        raise ValueError("n must be non-negative.")
+    if m < 1:
+        raise ValueError("Modulus must be a positive integer.")
+
+    if _worth_reducing(m, _saved_steps(n, m)):
+        n %= pisano_period(m)
+    return _fib_pair_mod(n, m)[0]
+
+
+# the period is never computed past this, trial division would take around sqrt(m) steps
+PISANO_LIMIT = 10**9
+# one fast doubling step costs about as much as this many trial divisions
+DOUBLING_COST = 2
+
+
+def _saved_steps(n, m):
+    # doubling steps n % pi(m) would save, the period is at most 6m
+    return max(0, n.bit_length() - m.bit_length() - 3)
+
+
+def _worth_reducing(m, saved_steps):
+    # a known period is free, otherwise factoring m and searching pi(p) takes about
+    # sqrt(m) trial divisions and has to be paid back by the doubling steps it saves
+    if m in _PERIODS:
+        return True
+    return m <= PISANO_LIMIT and saved_steps * DOUBLING_COST >= isqrt(m)
+
+
+### pisano period, pi(m) = lcm of pi(p^e) over the prime powers of m
+
+def _factorize(m):
+    factors = {}
+    d = 2
+    while d * d <= m:
+        while m % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            m //= d
+        d += 1 if d == 2 else 2
+    if m > 1:
+        factors[m] = factors.get(m, 0) + 1
+    return factors
+
+
+def _divisors(n):
+    divisors = [1]
+    for p, e in _factorize(n).items():
+        divisors = [d * p**i for d in divisors for i in range(e + 1)]
+    return sorted(divisors)
+
+
+def _pisano_prime(p):
+    if p == 2:
+        return 3
+    if p == 5:
+        return 20
+
+    # pi(p) divides p - 1 when p = +-1 (mod 10), and 2(p + 1) otherwise
+    bound = p - 1 if p % 10 in (1, 9) else 2 * (p + 1)
+    for d in _divisors(bound):
+        if _fib_pair_mod(d, p) == (0, 1):
+            return d
+    return bound
+
+
+# every period computed so far, by modulus
+_PERIODS = {1: 1}
+
+
+def pisano_period(m):
+    if m in _PERIODS:
+        return _PERIODS[m]
+
+    period = 1
+    for p, e in _factorize(m).items():
+        # pi(p^e) = p^(e-1) * pi(p), no counterexample to Wall's conjecture is known
+        period = lcm(period, p ** (e - 1) * _pisano_prime(p))
+    _PERIODS[m] = period
+    return period
+
+
+### batched queries
+
+# below this period a whole cycle of F mod m is tabulated once and every query is a lookup
+TABLE_LIMIT = 1 << 20
+
+
+def fib_mod_many(pairs):
+    pairs = list(pairs)
+    results = [0] * len(pairs)
+
+    # group the query positions by modulus, so each period and table is built once
+    groups = defaultdict(list)
+    for position, (n, m) in enumerate(pairs):
+        if n < 0:
+            raise ValueError("n must be non-negative.")
+        if m < 1:
+            raise ValueError("Modulus must be a positive integer.")
+        groups[m].append(position)
+
+    for m, positions in groups.items():
+        # a table answers every query of a group with one lookup once a whole period is tabulated
+        tabulate = len(positions) * 4 >= m and m <= TABLE_LIMIT
+        saved = sum(_saved_steps(pairs[position][0], m) for position in positions)
+        period = pisano_period(m) if tabulate or _worth_reducing(m, saved) else None
+        reduced = [pairs[position][0] % period if period else pairs[position][0] for position in positions]
+
+        if period and period <= TABLE_LIMIT and period <= 4 * len(positions):
+            table = _fib_table_mod(period, m)
+            for position, n in zip(positions, reduced):
+                results[position] = table[n]
+            continue
+
+        # repeated indices are answered once
+        answers = {}
+        for position, n in zip(positions, reduced):
+            if n not in answers:
+                answers[n] = _fib_pair_mod(n, m)[0]
+            results[position] = answers[n]
+
+    return results
+
+
+def _fib_table_mod(length, m):
+    table = [0] * length
+    a, b = 0, 1 % m
+    for i in range(length):
+        table[i] = a
+        a, b = b, (a + b) % m
+    return table
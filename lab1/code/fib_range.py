@@ -0,0 +1,123 @@
+# whole ranges of fibonacci numbers as numpy arrays instead of one call per index
+from math import sqrt
+
+import numpy as np
+
+from fib_fast_doubling import fib_fast_doubling_it
+
+PHI = (1 + sqrt(5)) / 2
+PSI = (1 - sqrt(5)) / 2
+
+# F(92) is the last value that fits int64, F(93) the last one that fits uint64
+INT64_MAX_INDEX = 92
+UINT64_MAX_INDEX = 93
+
+# products of two residues must fit in a uint64 lane
+MAX_LANE_MODULUS = 1 << 32
+
+
+def _small_table():
+    table = np.zeros(UINT64_MAX_INDEX + 1, dtype=np.uint64)
+    a, b = 0, 1
+    for i in range(UINT64_MAX_INDEX + 1):
+        table[i] = a
+        a, b = b, a + b
+    return table
+
+
+_FIB_UINT64 = _small_table()
+
+
+# F(a), F(a+1), ..., F(b)
+def fib_range(a, b, mod=None):
+    if a < 0 or b < a:
+        raise ValueError("Need 0 <= a <= b.")
+
+    if mod is not None:
+        return fib_mod_vec(np.arange(a, b + 1, dtype=np.uint64), mod)
+
+    if b <= INT64_MAX_INDEX:
+        return _FIB_UINT64[a:b + 1].astype(np.int64)
+    if b == UINT64_MAX_INDEX:
+        return _FIB_UINT64[a:b + 1].copy()
+
+    # past F(93) the values need python ints, seed the run with F(a) and F(a+1) then add
+    out = np.empty(b - a + 1, dtype=object)
+    x = fib_fast_doubling_it(a)
+    y = fib_fast_doubling_it(a + 1)
+    for i in range(b - a + 1):
+        out[i] = x
+        x, y = y, x + y
+    return out
+
+
+# F(n) mod m for every n of an index array, fast doubling run on all lanes at once
+def fib_mod_vec(indices, mod):
+    if mod < 1:
+        raise ValueError("Modulus must be a positive integer.")
+
+    indices = np.asarray(indices, dtype=np.uint64)
+    if mod > MAX_LANE_MODULUS:
+        return np.array([_fib_mod_scalar(int(n), mod) for n in indices], dtype=object)
+
+    m = np.uint64(mod)
+    a = np.zeros(indices.shape, dtype=np.uint64)
+    b = np.full(indices.shape, 1 % mod, dtype=np.uint64)
+
+    top = int(indices.max()).bit_length() if indices.size else 0
+    for j in range(top - 1, -1, -1):
+        # F(2k) = F(k)(2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2
+        c = a * ((2 * b + m - a) % m) % m
+        d = (a * a % m + b * b % m) % m
+
+        odd = ((indices >> np.uint64(j)) & np.uint64(1)).astype(bool)
+        a = np.where(odd, d, c)
+        b = np.where(odd, (c + d) % m, d)
+
+    return a
+
+
+def _fib_mod_scalar(n, m):
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        a, b = (d, (c + d) % m) if bit == "1" else (c, d)
+    return a
+
+
+### vectorised float approximations of fib_binet / fib_phi over whole index arrays
+
+def _to_exact_ints(values):
+    if values.size and np.abs(values).max() >= 2.0**63:
+        return np.array([int(v) for v in values], dtype=object)
+    return values.astype(np.int64)
+
+
+def fib_binet_vec(indices):
+    # np.power rounds differently from float **, so past F(86), where neither is exact any
+    # more, a value can differ from fib_binet's by about one unit in the last place
+    n = np.asarray(indices, dtype=np.float64)
+    return _to_exact_ints(np.rint((np.power(PHI, n) - np.power(PSI, n)) / sqrt(5)))
+
+
+def phi_differences(datapoints):
+    # |F(n) - phi approximation| for every index, both series in one pass over the index array
+    datapoints = np.asarray(datapoints)
+    actual_fibs = fib_range(0, int(datapoints.max()))[datapoints]
+    return datapoints, np.abs(actual_fibs - fib_phi_vec(datapoints))
+
+
+def fib_phi_vec(indices):
+    indices = np.asarray(indices, dtype=np.int64)
+    top = int(indices.max()) if indices.size else 0
+
+    # each term is rounded from the previous one, so the chain is walked once up to the largest index
+    chain = np.zeros(max(top, 5) + 1, dtype=np.float64)
+    chain[:6] = [0, 1, 1, 2, 3, 5]
+    fn = 5
+    for t in range(6, top + 1):
+        fn = round(fn * PHI)
+        chain[t] = fn
+
+    return _to_exact_ints(chain[indices])
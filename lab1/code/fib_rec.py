@@ -1,3 +1,130 @@
+from collections import OrderedDict
+
+
 # first method, recursion
 def fib_rec(n):
-    return n if n <= 1 else fib_rec(n-1) + fib_rec(n-2)
\ No newline at end of file
+    return n if n <= 1 else fib_rec(n-1) + fib_rec(n-2)
+
+
+### drop-in recursion engine with selectable strategies
+#
+#   "memo"       - recursion over a bounded LRU cache
+#   "table"      - bottom-up tabulation, no recursion at all
+#   "trampoline" - the memoised recursion driven by an explicit stack
+
+STRATEGIES = ("memo", "table", "trampoline")
+
+# deepest recursion the memo strategy allows before it warms the cache in steps
+MEMO_STEP = 200
+
+
+class FibRec:
+    def __init__(self, strategy: str = "memo", maxsize: int = 1024):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {STRATEGIES}.")
+        if maxsize < 3:
+            raise ValueError("The cache must hold at least 3 values.")
+
+        self.strategy = strategy
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f"FibRec({self.strategy!r}, maxsize={self.maxsize})"
+
+    def __call__(self, n: int) -> int:
+        if n < 0:
+            raise ValueError("n must be non-negative.")
+
+        if self.strategy == "table":
+            return self._table(n)
+        elif self.strategy == "trampoline":
+            return self._trampoline(n)
+
+        # computing in steps of MEMO_STEP keeps the recursion depth bounded for any n
+        for k in range(MEMO_STEP, n, MEMO_STEP):
+            self._memo(k)
+        return self._memo(n)
+
+    ### LRU cache
+
+    def _get(self, k):
+        if k in self._cache:
+            self._cache.move_to_end(k)
+            self.hits += 1
+            return self._cache[k]
+        self.misses += 1
+        return None
+
+    def _put(self, k, value):
+        self._cache[k] = value
+        self._cache.move_to_end(k)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "strategy": self.strategy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    ### strategies
+
+    def _memo(self, n):
+        if n <= 1:
+            return n
+
+        value = self._get(n)
+        if value is None:
+            value = self._memo(n - 1) + self._memo(n - 2)
+            self._put(n, value)
+        return value
+
+    def _table(self, n):
+        table = [0] * (n + 1)
+        if n > 0:
+            table[1] = 1
+        for i in range(2, n + 1):
+            table[i] = table[i - 1] + table[i - 2]
+        return table[n]
+
+    def _trampoline(self, n):
+        if n <= 1:
+            return n
+
+        stack = [n]
+        while stack:
+            k = stack[-1]
+            if k <= 1 or k in self._cache:
+                stack.pop()
+                continue
+
+            a = k - 1 if k - 1 <= 1 else self._get(k - 1)
+            b = k - 2 if k - 2 <= 1 else self._get(k - 2)
+
+            if a is not None and b is not None:
+                self._put(k, a + b)
+                stack.pop()
+                continue
+
+            # k - 1 goes on top so it is computed first and leaves k - 2 cached
+            if b is None:
+                stack.append(k - 2)
+            if a is None:
+                stack.append(k - 1)
+
+        return self._get(n)
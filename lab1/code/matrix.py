@@ -10,10 +10,17 @@ def fib_matrix(n):
 ### some util functions
 
 def power(F, n):
-    M = [[1, 1],
-         [1, 0]]
-    
-    for _ in range(2, n + 1):
+    # repeated squaring, O(log n) multiplications instead of n - 1
+    if n <= 1:
+        return
+
+    M = [[F[0][0], F[0][1]],
+         [F[1][0], F[1][1]]]
+
+    power(F, n // 2)
+    multiply(F, F)
+
+    if n % 2:
         multiply(F, M)
 
 def multiply(F, M):
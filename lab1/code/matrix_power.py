@@ -0,0 +1,130 @@
+# matrix exponentiation by repeated squaring, O(log n) matrix products
+#
+# works for any k x k integer matrix, so the same engine gives fibonacci
+# (the 2x2 [[1, 1], [1, 0]] matrix) and any linear recurrence of order k
+
+
+class Matrix:
+    def __init__(self, rows: list[list[int]], mod: int = None):
+        size = len(rows)
+        if any(len(row) != size for row in rows):
+            raise ValueError("Only square matrices are supported.")
+        if mod is not None and mod < 1:
+            raise ValueError("Modulus must be a positive integer.")
+
+        self.size = size
+        self.mod = mod
+        self.rows = [[x % mod for x in row] for row in rows] if mod else [list(row) for row in rows]
+
+    @classmethod
+    def identity(cls, size: int, mod: int = None):
+        return cls([[int(i == j) for j in range(size)] for i in range(size)], mod)
+
+    def __mul__(self, other):
+        if self.size != other.size:
+            raise ValueError("Matrix sizes do not match.")
+
+        mod = self.mod or other.mod
+        if self.size == 2:
+            return Matrix(_multiply_2x2(self.rows, other.rows, mod), mod)
+
+        columns = list(zip(*other.rows))
+        rows = []
+        for row in self.rows:
+            new_row = [sum(a * b for a, b in zip(row, col)) for col in columns]
+            rows.append([x % mod for x in new_row] if mod else new_row)
+        return Matrix(rows, mod)
+
+    def __pow__(self, n: int):
+        return mat_pow(self, n)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, Matrix):
+            return False
+        return self.rows == other.rows and self.mod == other.mod
+
+    def __repr__(self):
+        return f"Matrix({self.rows}, mod={self.mod})"
+
+
+def _multiply_2x2(F, M, mod=None):
+    x = F[0][0] * M[0][0] + F[0][1] * M[1][0]
+    y = F[0][0] * M[0][1] + F[0][1] * M[1][1]
+    z = F[1][0] * M[0][0] + F[1][1] * M[1][0]
+    w = F[1][0] * M[0][1] + F[1][1] * M[1][1]
+
+    if mod:
+        return [[x % mod, y % mod], [z % mod, w % mod]]
+    return [[x, y], [z, w]]
+
+
+def mat_pow(M: Matrix, n: int, method: str = "iterative") -> Matrix:
+    if n < 0:
+        raise ValueError("Negative powers are not supported.")
+
+    if method == "iterative":
+        return _mat_pow_iterative(M, n)
+    elif method == "recursive":
+        return _mat_pow_recursive(M, n)
+
+    raise ValueError(f"Unknown method '{method}', expected 'iterative' or 'recursive'.")
+
+
+def _mat_pow_iterative(M, n):
+    result = Matrix.identity(M.size, M.mod)
+    base = M
+
+    # scan the bits of n from the lowest one, squaring the base each step
+    while n:
+        if n & 1:
+            result = result * base
+        n >>= 1
+        if n:
+            base = base * base
+
+    return result
+
+
+def _mat_pow_recursive(M, n):
+    if n == 0:
+        return Matrix.identity(M.size, M.mod)
+
+    half = _mat_pow_recursive(M, n // 2)
+    square = half * half
+
+    return square * M if n % 2 else square
+
+
+def companion_matrix(coefficients: list[int], mod: int = None) -> Matrix:
+    # a(n) = c1 * a(n-1) + c2 * a(n-2) + ... + ck * a(n-k)
+    k = len(coefficients)
+    rows = [list(coefficients)]
+    for i in range(k - 1):
+        rows.append([int(j == i) for j in range(k)])
+    return Matrix(rows, mod)
+
+
+def linear_recurrence(coefficients: list[int], initial: list[int], n: int, mod: int = None, method: str = "iterative") -> int:
+    # initial holds a(0), a(1), ..., a(k-1)
+    k = len(coefficients)
+    if len(initial) != k:
+        raise ValueError("Need exactly one initial value per coefficient.")
+
+    if n < k:
+        return initial[n] % mod if mod else initial[n]
+
+    P = mat_pow(companion_matrix(coefficients, mod), n - k + 1, method)
+
+    # the first row of P applied to [a(k-1), ..., a(0)] gives a(n)
+    value = sum(c * a for c, a in zip(P[0], reversed(initial)))
+    return value % mod if mod else value
+
+
+# fibonacci through the 2x2 matrix [[1, 1], [1, 0]]^n = [[F(n+1), F(n)], [F(n), F(n-1)]]
+def fib_matrix_pow(n: int, mod: int = None, method: str = "iterative") -> int:
+    if n == 0:
+        return 0
+    return mat_pow(Matrix([[1, 1], [1, 0]], mod), n, method)[0][1]
@@ -1,3 +1,12 @@
+from math import sqrt
+
+import phi_powers
+
+PHI = (1 + sqrt(5)) / 2
+
+f = [0, 1, 1, 2, 3, 5]
+
+
 # using phi approximation
 def fib_phi(n):
  
@@ -11,4 +20,23 @@ def fib_phi(n):
         fn = round(fn * PHI)
         t+=1
     
-    return fn
\ No newline at end of file
+    return fn
+
+
+# phi approximation with an exact phi, F(k + j) = round(F(k) * phi^j) holds while j < k,
+# so the index can nearly double each step instead of growing by one
+def fib_phi_exact(n):
+
+    if n < 6:
+        return f[n]
+
+    k = 5
+    fn = 5
+
+    while k < n:
+        j = min(k - 1, n - k)
+        precision = phi_powers.precision_for(k + j)
+        fn = phi_powers.round_to_int(phi_powers.multiply_int(fn, phi_powers.phi_power(j, precision), precision))
+        k += j
+
+    return fn
@@ -0,0 +1,105 @@
+# arbitrary precision powers of phi, shared by the exact binet and phi methods
+#
+# a number is kept as (mantissa, exponent) meaning mantissa * 2^exponent,
+# with the mantissa truncated to a fixed number of bits, like a float with
+# as many bits as the requested fibonacci number needs
+from math import log2, sqrt
+
+LOG2_PHI = log2((1 + 5**0.5) / 2)
+
+
+# enough bits for F(n) plus a guard for the rounding error of ~2 log n multiplications,
+# the binary counterpart of picking log10(phi) * n decimal digits
+def precision_for(n):
+    return int(n * LOG2_PHI) + 2 * n.bit_length() + 32
+
+
+def truncate(x, precision):
+    m, e = x
+    shift = m.bit_length() - precision
+    if shift > 0:
+        return m >> shift, e + shift
+    return m, e
+
+
+def multiply(x, y, precision):
+    return truncate((x[0] * y[0], x[1] + y[1]), precision)
+
+
+def multiply_int(k, x, precision):
+    return truncate((k * x[0], x[1]), precision)
+
+
+def round_to_int(x):
+    m, e = x
+    if e >= 0:
+        return m << e
+    return (m + (1 << (-e - 1))) >> (-e)
+
+
+### cache, phi^(2^i) at the largest precision asked for so far
+
+_cache = {"precision": 0, "inv_sqrt5": None, "powers": []}
+
+# grow the cached precision a bit past the request so a series of increasing n reuses it
+PRECISION_GROWTH = 1.25
+
+
+def _inv_sqrt5_scaled(precision):
+    # newton's iteration y <- y + y(1 - 5y^2)/2 only multiplies, isqrt and big
+    # integer division are quadratic; the correct bits double every step
+    guard = 32
+    target = precision + guard
+    bits = 50
+    y = int(2**bits / sqrt(5))
+    while bits < target:
+        new = min(2 * bits, target)
+        y <<= new - bits
+        error = (1 << (2 * new)) - 5 * y * y
+        y += (y * error) >> (2 * new + 1)
+        bits = new
+    return y >> guard
+
+
+def _rebuild(precision):
+    inv = _inv_sqrt5_scaled(precision)
+    _cache["precision"] = precision
+    # 1 / sqrt(5) is kept instead of sqrt(5) so binet needs no division
+    _cache["inv_sqrt5"] = (inv, -precision)
+    # phi = (1 + sqrt(5)) / 2 = 1/2 + 5/2 * (1 / sqrt(5))
+    _cache["powers"] = [(((1 << precision) + 5 * inv) >> 1, -precision)]
+
+
+def _cached(precision, count):
+    if precision > _cache["precision"]:
+        _rebuild(int(precision * PRECISION_GROWTH))
+
+    top = _cache["precision"]
+    powers = _cache["powers"]
+    while len(powers) < count:
+        powers.append(multiply(powers[-1], powers[-1], top))
+
+    return powers
+
+
+def cache_info():
+    return {"precision": _cache["precision"], "powers": len(_cache["powers"])}
+
+
+def clear_cache():
+    _cache.update(precision=0, inv_sqrt5=None, powers=[])
+
+
+def inv_sqrt5(precision):
+    _cached(precision, 1)
+    return truncate(_cache["inv_sqrt5"], precision)
+
+
+def phi_power(n, precision):
+    powers = _cached(precision, max(n.bit_length(), 1))
+
+    result = (1, 0)
+    for i in range(n.bit_length()):
+        if (n >> i) & 1:
+            result = multiply(result, truncate(powers[i], precision), precision)
+    return result
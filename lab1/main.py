@@ -1,6 +1,23 @@
-import matplotlib.pyplot as plt
-import time
-from tabulate import tabulate
+import os
+import sys
+
+# the standalone method implementations live next to this file in code/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "code"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from common.benchmark import measure
+from common.results import ResultStore
+from common.report import pyplot
+
+from matrix_power import fib_matrix_pow
+from fib_fast_doubling import fib_fast_doubling_it
+from binet import fib_binet_exact
+from phi import fib_phi_exact
+from phi_powers import precision_for
+from fib_rec import FibRec, STRATEGIES
+
+# every measurement of this run goes to the shared results store
+results_run = ResultStore().start_run("lab1")
 
 # first method, recursion
 def fib_rec(n):
@@ -9,7 +26,9 @@ def fib_rec(n):
 
 def plot(datapoints, data, title):
 
-
+    # matplotlib is only loaded when something is actually drawn
+    plt = pyplot()
+    plt.figure()
     plt.title(title, weight = "bold")
     plt.xticks(datapoints)
     plt.xlabel("$f_n$")
@@ -21,7 +40,8 @@ def plot(datapoints, data, title):
     ax.set_facecolor("#424c51")
     
     plt.plot(datapoints, data, marker="o", color="#eb9191")
-    plt.show()
+    plt.savefig(f"{title.replace(' ', '_').lower()}.png")
+    plt.close()
 
 
 # second method, using matrix multimplication
@@ -34,10 +54,17 @@ def fib_matrix(n):
     return F[0][0]
 
 def power(F, n):
-    M = [[1, 1],
-         [1, 0]]
-    
-    for _ in range(2, n + 1):
+    # repeated squaring, O(log n) multiplications instead of n - 1
+    if n <= 1:
+        return
+
+    M = [[F[0][0], F[0][1]],
+         [F[1][0], F[1][1]]]
+
+    power(F, n // 2)
+    multiply(F, F)
+
+    if n % 2:
         multiply(F, M)
 
 def multiply(F, M):
@@ -120,14 +147,15 @@ def fib_fast_doubling(n):
     return fib_doubling(n)[0]
 
 
-def calculate_func_exec_time(func, datapoints):
+def calculate_func_exec_time(func, datapoints, family="fib", **options):
 
     times = []
 
     for dpt in datapoints:
-        start = time.time()
-        _ = func(dpt) # no need to use the value at this point
-        times.append(time.time() - start)
+        # median of repeated runs, options are passed on to measure
+        timing = measure(func, dpt, **options)
+        results_run.record(getattr(func, "__name__", repr(func)), family, dpt, timing)
+        times.append(timing.median)
     return times, datapoints
 
 
@@ -151,32 +179,76 @@ def print_custom_table(datapoints, times, float_format=".6f"):
     print(format_row(["Time"] + formatted_times))
     print(separator)
 
-nprange = lambda minim, maxim, division: range(minim, maxim, (maxim-minim) // division)
-n = nprange(5, 30, 20)
+def compare_methods(funcs, datapoints, **options):
 
+    rows = []
+    for func in funcs:
+        times, _ = calculate_func_exec_time(func, datapoints, "large_n", **options)
+        rows.append([func.__name__] + [f"{t:.6f}" for t in times])
 
-def plot_fib_diff(datapoints):
+    from tabulate import tabulate
+    print(tabulate(rows, headers=["Method"] + [str(dp) for dp in datapoints], tablefmt="grid"))
 
-    actual_fibs = fibs_upto(datapoints[-1] + 1)  # Include the last value in datapoints
-    binet_fibs = [fib_phi(n) for n in datapoints]
-    
-    # Calculate the differences
-    differences = [abs(actual_fibs[i] - binet_fibs[i]) for i in range(len(datapoints))]
-    
-    # Plotting
-    plt.plot(datapoints, differences, color="#eb9191")
-    plt.title("Difference Between Actual Fibonacci and Phi Approximation", weight="bold")
-    plt.xlabel("Fibonacci Index")
-    plt.ylabel("Difference")
-    plt.grid()
-    plt.show()
+
+def report_exact_methods(datapoints):
+
+    rows = []
+    for dpt in datapoints:
+        (binet_time,), _ = calculate_func_exec_time(fib_binet_exact, [dpt], "exact")
+        (phi_time,), _ = calculate_func_exec_time(fib_phi_exact, [dpt], "exact")
+        (doubling_time,), _ = calculate_func_exec_time(fib_fast_doubling, [dpt], "exact")
+
+        exact = fib_fast_doubling(dpt)
+        float_ok = dpt < 1475 and fib_binet(dpt) == exact  # phi**n overflows a float past that
+        rows.append([dpt, precision_for(dpt), f"{binet_time:.6f}", f"{phi_time:.6f}", f"{doubling_time:.6f}", float_ok])
+
+    headers = ["n", "Precision (bits)", "Exact Binet", "Exact Phi", "Fast Doubling", "Float Binet Correct"]
+    from tabulate import tabulate
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
+def _call_engine(engine, n):
+    return engine(n)
+
+
+def benchmark_fib_rec(datapoints, maxsize=1024):
+
+    rows = []
+    for strategy in STRATEGIES:
+        times = []
+        for dpt in datapoints:
+            # a fresh engine for every sample, a warm cache would turn the repeats into dict lookups
+            timing = measure(_call_engine, setup=lambda: (FibRec(strategy, maxsize), dpt))
+            results_run.record(repr(FibRec(strategy, maxsize)), "fib", dpt, timing)
+            times.append(timing.median)
+
+        # the cache statistics of one cold call on the largest n
+        engine = FibRec(strategy, maxsize)
+        engine(max(datapoints))
+        stats = engine.stats()
+        rows.append([strategy] + [f"{t:.6f}" for t in times] + [f"{stats['hit_rate']:.2%}", stats["evictions"]])
+
+    headers = ["Strategy"] + [str(dp) for dp in datapoints] + ["Hit Rate", "Evictions"]
+    from tabulate import tabulate
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
+nprange = lambda minim, maxim, division: range(minim, maxim, (maxim-minim) // division)
+n = nprange(5, 30, 20)
 
 
-times, datapoints = calculate_func_exec_time(fib_binet, n)
-print_custom_table(datapoints, times)
+if __name__ == "__main__":
 
+    times, datapoints = calculate_func_exec_time(fib_binet, n)
+    print_custom_table(datapoints, times)
 
+    # O(log n) matrix power against fast doubling, up to n = 10^7
+    compare_methods([fib_matrix_pow, fib_fast_doubling, fib_fast_doubling_it], [10**3, 10**4, 10**5, 10**6, 10**7], warmup=0, min_repeat=1)
 
-plot_fib_diff(range(0, 82))
+    # exact binet / phi against fast doubling, precision grows with n * log2(phi)
+    report_exact_methods([10, 70, 80, 1000, 10**4, 10**5, 10**6])
 
+    # the recursion engine goes far past n = 40 without hitting the recursion limit
+    benchmark_fib_rec([40, 100, 1000, 10_000, 50_000])
 
+    print(f"timings stored as run {results_run.run_id}, render them with: python -m common.report --run {results_run.run_id}")
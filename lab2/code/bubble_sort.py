@@ -1,4 +1,9 @@
-def bubble_sort(a: list):
+from key_sort import sort_with_key
+
+def bubble_sort(a: list, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(bubble_sort, a, key, reverse)
+
     n = len(a)
     for i in range(n - 1):
         for j in range(n - i - 1):
@@ -1,4 +1,9 @@
-def bubble_sort_impr(a: list):
+from key_sort import sort_with_key
+
+def bubble_sort_impr(a: list, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(bubble_sort_impr, a, key, reverse)
+
     n = len(a)
     for i in range(n - 1):
         swapped = False
@@ -9,3 +14,137 @@ def bubble_sort_impr(a: list):
 
         if not swapped:
             break
+
+    return a
+
+
+### bubble family
+#
+# bubble_sort_bounded - the next pass stops where the last swap of this one happened
+# cocktail_sort       - bounded passes in both directions, small values at the end move fast too
+# comb_sort           - bubble passes over a gap that shrinks by 1.3, down to a bounded bubble sort
+
+COMB_SHRINK = 1.3
+# cocktail passes are picked while the input has at most this many inversions per element
+COCKTAIL_INVERSIONS = 1
+
+def bubble_sort_bounded(a: list, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(bubble_sort_bounded, a, key, reverse)
+
+    end = len(a) - 1
+    while end > 0:
+        last_swap = 0
+        for j in range(end):
+            if a[j] > a[j + 1]:
+                a[j], a[j + 1] = a[j + 1], a[j]
+                last_swap = j
+        # everything after the last swap is already in place
+        end = last_swap
+    return a
+
+def cocktail_sort(a: list, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(cocktail_sort, a, key, reverse)
+
+    low, high = 0, len(a) - 1
+    while low < high:
+        last_swap = low
+        for j in range(low, high):
+            if a[j] > a[j + 1]:
+                a[j], a[j + 1] = a[j + 1], a[j]
+                last_swap = j
+        high = last_swap
+
+        last_swap = high
+        for j in range(high, low, -1):
+            if a[j - 1] > a[j]:
+                a[j - 1], a[j] = a[j], a[j - 1]
+                last_swap = j
+        low = last_swap
+    return a
+
+def comb_sort(a: list, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(comb_sort, a, key, reverse)
+
+    n = len(a)
+    gap = n
+    while gap > 1:
+        gap = int(gap / COMB_SHRINK)
+        # the 9, 10 -> 11 rule avoids the gap sequences that leave turtles behind
+        if gap in (9, 10):
+            gap = 11
+        gap = max(gap, 1)
+        if gap == 1:
+            break
+        for j in range(n - gap):
+            if a[j] > a[j + gap]:
+                a[j], a[j + gap] = a[j + gap], a[j]
+    return bubble_sort_bounded(a)
+
+
+### presortedness
+
+def count_runs(a: list):
+    # number of maximal non-decreasing runs, 1 for sorted input
+    if not a:
+        return 0
+    return 1 + sum(1 for j in range(len(a) - 1) if a[j] > a[j + 1])
+
+def count_inversions(a: list, limit=None):
+    # pairs i < j with a[i] > a[j], by bottom-up merge counting,
+    # stops as soon as the count is past limit and returns limit + 1
+    src = list(a)
+    n = len(src)
+    dst = [None] * n
+    inversions = 0
+    width = 1
+    while width < n:
+        for low in range(0, n, 2 * width):
+            mid = min(low + width, n)
+            high = min(low + 2 * width, n)
+            i, j, k = low, mid, low
+            while i < mid and j < high:
+                if src[j] < src[i]:
+                    dst[k] = src[j]
+                    j += 1
+                    inversions += mid - i
+                else:
+                    dst[k] = src[i]
+                    i += 1
+                k += 1
+            dst[k:high] = src[i:mid] if i < mid else src[j:high]
+            if limit is not None and inversions > limit:
+                return limit + 1
+        src, dst = dst, src
+        width *= 2
+    return inversions
+
+def presortedness(a: list):
+    runs = count_runs(a)
+    return {
+        "runs": runs,
+        # a single run has no inversions, and past the cocktail threshold the exact count
+        # does not change the choice, so the counting stops there
+        "inversions": 0 if runs <= 1 else count_inversions(a, COCKTAIL_INVERSIONS * len(a)),
+    }
+
+def choose_bubble_variant(a: list):
+    # None when a is already sorted, cocktail passes when every element is close to its
+    # place, comb sort otherwise
+    measure = presortedness(a)
+    if measure["runs"] <= 1:
+        return None
+    if measure["inversions"] <= COCKTAIL_INVERSIONS * len(a):
+        return cocktail_sort
+    return comb_sort
+
+def bubble_sort_adaptive(a: list, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(bubble_sort_adaptive, a, key, reverse)
+
+    variant = choose_bubble_variant(a)
+    if variant is not None:
+        variant(a)
+    return a
@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+
+### input distributions for the sorting benchmarks
+#
+# every family is built with a handful of numpy calls from a seeded generator, and
+# a seeded array is cached as .npy, so a repeated run loads it instead of rebuilding it
+
+CACHE_DIR = os.environ.get(
+    "AA_DISTRIBUTIONS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "results", "distributions"),
+)
+
+MAX_VALUE = 1_000_000
+
+
+def _random(rng, n):
+    return rng.integers(1, MAX_VALUE, n, endpoint=True)
+
+
+def _sorted(rng, n):
+    return np.sort(_random(rng, n))
+
+
+def _reverse_sorted(rng, n):
+    return _sorted(rng, n)[::-1].copy()
+
+
+def _partially_sorted(rng, n, step=None):
+    # sorted, then arr[i] and arr[i + step - 1] exchanged for every i that is a multiple of step
+    arr = _sorted(rng, n)
+    step = step or max(5, n // 20)
+    left = np.arange(0, max(n - step, 0), step)
+    right = left + step - 1
+    arr[left], arr[right] = arr[right], arr[left].copy()
+    return arr
+
+
+def _few_unique(rng, n, unique=10):
+    return rng.choice(rng.integers(1, MAX_VALUE, unique, endpoint=True), n)
+
+
+def _organ_pipe(rng, n):
+    # ascending to the middle, then descending
+    arr = _sorted(rng, n)
+    return np.concatenate([arr[0::2], arr[1::2][::-1]])
+
+
+def _sawtooth(rng, n, teeth=16):
+    # teeth ascending runs of the same length one after the other
+    arr = _random(rng, n)
+    for tooth in np.array_split(np.arange(n), teeth):
+        arr[tooth] = np.sort(arr[tooth])
+    return arr
+
+
+def _zipf(rng, n, a=1.5):
+    # heavy duplicates, a few values make up most of the array
+    return np.minimum(rng.zipf(a, n), MAX_VALUE)
+
+
+def _nearly_sorted(rng, n, k=None):
+    # distinct sorted keys with exactly k inversions, k disjoint adjacent pairs exchanged
+    arr = np.arange(1, n + 1)
+    pairs = np.arange(0, n - 1, 2)
+    k = min(len(pairs), max(1, n // 100) if k is None else k)
+    left = rng.choice(pairs, k, replace=False)
+    arr[left], arr[left + 1] = arr[left + 1], arr[left].copy()
+    return arr
+
+
+def _median_of_3_killer(rng, n):
+    # Musser's sequence, a median-of-3 (first, middle, last) quicksort makes every
+    # partition split off only two elements, the tail that does not fit 2k with an
+    # even k keeps the largest values in order
+    k = (n // 2) & ~1
+    arr = np.empty(n, dtype=np.int64)
+    j = np.arange(k)
+    arr[:k] = np.where(j % 2 == 0, j + 1, k + j)
+    arr[k:2 * k] = 2 * (j + 1)
+    arr[2 * k:] = np.arange(2 * k + 1, n + 1)
+    return arr
+
+
+FAMILIES = {
+    "random": _random,
+    "sorted": _sorted,
+    "reverse_sorted": _reverse_sorted,
+    "partially_sorted": _partially_sorted,
+    "few_unique": _few_unique,
+    "organ_pipe": _organ_pipe,
+    "sawtooth": _sawtooth,
+    "zipf": _zipf,
+    "nearly_sorted": _nearly_sorted,
+    "median_of_3_killer": _median_of_3_killer,
+}
+
+
+def generate(family: str, n: int, seed: int = None, cache: bool = True, **params) -> np.ndarray:
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown family '{family}', expected one of {tuple(FAMILIES)}.")
+
+    # an unseeded array is different every time, there is nothing to cache
+    cache = cache and seed is not None
+    if cache:
+        suffix = "".join(f"_{name}={value}" for name, value in sorted(params.items()))
+        path = os.path.join(CACHE_DIR, f"{family}_{n}_{seed}{suffix}.npy")
+        if os.path.exists(path):
+            return np.load(path)
+
+    arr = FAMILIES[family](np.random.default_rng(seed), n, **params).astype(np.int64, copy=False)
+
+    if cache:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # written under a temporary name first so a concurrent run never reads half a file
+        tmp = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, arr)
+        os.replace(tmp, path)
+    return arr
+
+
+def generate_list(family: str, n: int, seed: int = None, **params) -> list:
+    return generate(family, n, seed, **params).tolist()
@@ -0,0 +1,187 @@
+import array
+import heapq
+import mmap
+import os
+import sys
+import tempfile
+from itertools import islice
+
+from heap_sort import heap_sort_dary
+from intro_sort import intro_sort
+from merge_sort import merge_sort_bottom_up
+
+### external merge sort for files that do not fit in memory
+#
+# the input is cut into chunks that fit the memory budget, every chunk is sorted
+# with one of the lab2 engines and spilled as a binary int64 run to a temp file,
+# then the runs are merged fan_in at a time with a heap until one is left
+#
+#   fmt "binary" - native-endian int64 records
+#   fmt "text"   - one integer per line
+
+ENGINES = {
+    "merge_sort_bottom_up": merge_sort_bottom_up,
+    "intro_sort": intro_sort,
+    "heap_sort_dary": heap_sort_dary,
+}
+FORMATS = ("binary", "text")
+READERS = ("buffered", "mmap")
+
+MEMORY_BUDGET = 64 * 1024 * 1024
+FAN_IN = 16
+ITEM_SIZE = 8
+
+# bytes every key of a chunk costs besides its int object, the list slot and the int64
+# array of a binary read, the merge buffer of the engine or the array the run is spilled
+# from, with 8 bytes to spare for the slack of the list and the allocator
+KEY_OVERHEAD = 3 * 8
+# bytes one key costs in the output block of a merge, the int object, its list slot and
+# the int64 array, plus its decimal string and its share of the joined line for text
+WRITE_BYTES_PER_KEY = {"binary": 64, "text": 160}
+# keys read up front to measure the int objects of the input
+SIZE_SAMPLE = 4096
+
+
+### input chunks
+
+def _binary_chunks(path, chunk_keys):
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_keys * ITEM_SIZE)
+            if not data:
+                return
+            if len(data) % ITEM_SIZE:
+                raise ValueError(f"{path} is not a whole number of int64 records.")
+            chunk = array.array("q")
+            chunk.frombytes(data)
+            # neither the raw bytes nor, once resumed, the last chunk may stay alive in
+            # this frame while the next chunk is built or sorted
+            del data
+            keys = chunk.tolist()
+            del chunk
+            yield keys
+            del keys
+
+
+def _text_chunks(path, chunk_keys):
+    with open(path) as f:
+        chunk = []
+        for line in f:
+            if line.strip():
+                chunk.append(int(line))
+            if len(chunk) == chunk_keys:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _bytes_per_key(path, fmt):
+    # the largest int object of a sample from the start of the input, big values make every
+    # key dearer, and a list of small ints would otherwise be assumed for the whole file
+    chunks = _binary_chunks(path, SIZE_SAMPLE) if fmt == "binary" else _text_chunks(path, SIZE_SAMPLE)
+    sample = next(chunks, [])
+    chunks.close()
+    return max(map(sys.getsizeof, sample), default=sys.getsizeof(0)) + KEY_OVERHEAD
+
+
+### run readers, each yields the keys of one run in order
+
+def _buffered_reader(path, buffer_size):
+    # one int64 block read into in place, a read() would keep its bytes next to the array
+    block = array.array("q", bytes(max(ITEM_SIZE, buffer_size // ITEM_SIZE * ITEM_SIZE)))
+    with open(path, "rb") as f:
+        while True:
+            size = f.readinto(block)
+            if not size:
+                return
+            if size < len(block) * ITEM_SIZE:
+                del block[size // ITEM_SIZE:]
+            yield from block
+
+
+def _mmap_reader(path, buffer_size):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        keys = memoryview(mapped).cast("q")
+        try:
+            # iterating the view makes one int at a time, a tolist() block would hold
+            # buffer_size // 8 int objects per run, several times its share of the budget
+            yield from keys
+        finally:
+            keys.release()
+
+
+### writer
+
+def _write_sorted(keys, path, fmt, buffer_keys):
+    keys = iter(keys)
+    with open(path, "wb" if fmt == "binary" else "w") as f:
+        while True:
+            block = list(islice(keys, buffer_keys))
+            if not block:
+                return
+            if fmt == "binary":
+                array.array("q", block).tofile(f)
+            else:
+                f.write("\n".join(map(str, block)) + "\n")
+
+
+def _merge(paths, dst, fmt, buffer_size, reader):
+    read = _mmap_reader if reader == "mmap" else _buffered_reader
+    merged = heapq.merge(*(read(path, buffer_size) for path in paths))
+    _write_sorted(merged, dst, fmt, max(1, buffer_size // WRITE_BYTES_PER_KEY[fmt]))
+
+
+def external_sort(src, dst, fmt="binary", memory_budget=MEMORY_BUDGET, fan_in=FAN_IN,
+                  engine="merge_sort_bottom_up", reader="buffered", tmp_dir=None):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}.")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {tuple(ENGINES)}.")
+    if reader not in READERS:
+        raise ValueError(f"Unknown reader '{reader}', expected one of {READERS}.")
+    if fan_in < 2:
+        raise ValueError("The merge needs a fan-in of at least 2.")
+
+    chunk_keys = max(1, memory_budget // _bytes_per_key(src, fmt))
+    # while merging the budget is shared by fan_in read buffers and the output buffer
+    buffer_size = max(ITEM_SIZE, memory_budget // (fan_in + 1) // ITEM_SIZE * ITEM_SIZE)
+    chunks = _binary_chunks(src, chunk_keys) if fmt == "binary" else _text_chunks(src, chunk_keys)
+
+    stats = {"keys": 0, "runs": 0, "merge_passes": 0, "bytes": os.path.getsize(src)}
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix="external_sort_") as work_dir:
+        runs = []
+        for chunk in chunks:
+            ENGINES[engine](chunk)
+            path = os.path.join(work_dir, f"run_{len(runs)}.bin")
+            with open(path, "wb") as f:
+                array.array("q", chunk).tofile(f)
+            runs.append(path)
+            stats["keys"] += len(chunk)
+            # dropped before the next chunk is read, or two chunks would be held at once
+            del chunk
+        stats["runs"] = len(runs)
+
+        # intermediate passes until the last merge can take every run at once
+        generation = 0
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                path = os.path.join(work_dir, f"merge_{generation}_{len(merged)}.bin")
+                _merge(group, path, "binary", buffer_size, reader)
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            runs = merged
+            generation += 1
+            stats["merge_passes"] += 1
+
+        _merge(runs, dst, fmt, buffer_size, reader)
+        stats["merge_passes"] += 1
+
+    return stats
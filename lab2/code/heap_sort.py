@@ -1,3 +1,5 @@
+from key_sort import sort_with_key
+
 def heapify(arr, n, i):
     
     largest = i 
@@ -16,8 +18,12 @@ def heapify(arr, n, i):
 
         heapify(arr, n, largest)
 
-def heap_sort(arr):
-    
+def heap_sort(arr, key=None, reverse=False):
+
+    # the decorated index also makes the heap sort stable
+    if key is not None or reverse:
+        return sort_with_key(heap_sort, arr, key, reverse)
+
     n = len(arr) 
 
     for i in range(n // 2 - 1, -1, -1):
@@ -26,4 +32,133 @@ def heap_sort(arr):
     for i in range(n - 1, 0, -1):
       
         arr[0], arr[i] = arr[i], arr[0] 
-        heapify(arr, i, 0)
\ No newline at end of file
+        heapify(arr, i, 0)
+
+    return arr
+
+### range version, used as the fallback of intro_sort
+
+def _sift_down_range(arr, low, n, i):
+    # same as heapify on the heap stored in arr[low..low + n - 1], but without recursion
+    while True:
+        largest = i
+        l = 2 * i + 1
+        r = 2 * i + 2
+
+        if l < n and arr[low + l] > arr[low + largest]:
+            largest = l
+        if r < n and arr[low + r] > arr[low + largest]:
+            largest = r
+
+        if largest == i:
+            return
+
+        arr[low + i], arr[low + largest] = arr[low + largest], arr[low + i]
+        i = largest
+
+def heap_sort_range(arr, low, high):
+
+    n = high - low + 1
+
+    for i in range(n // 2 - 1, -1, -1):
+        _sift_down_range(arr, low, n, i)
+
+    for i in range(n - 1, 0, -1):
+        arr[low], arr[low + i] = arr[low + i], arr[low]
+        _sift_down_range(arr, low, i, 0)
+
+
+### d-ary heap sort, sift-down by moving a hole instead of swapping
+#
+# Floyd's construction builds the heap bottom-up in O(n), every extraction then
+# walks the hole from the root down to a leaf along the larger children without
+# comparing against the moved element, and sifts that element back up from the
+# leaf, which is usually only a step or two
+
+HEAP_ARITIES = (2, 4, 8)
+
+def _sift_down_hole(arr, i, n, d, x):
+    # places x, taken out of position i, into the heap arr[0..n - 1]
+    comparisons = 0
+    while True:
+        child = d * i + 1
+        if child >= n:
+            break
+        if d == 2:
+            if child + 1 < n:
+                comparisons += 1
+                if arr[child + 1] > arr[child]:
+                    child += 1
+        else:
+            last = min(child + d, n)
+            comparisons += last - child - 1
+            largest = arr[child]
+            for c in range(child + 1, last):
+                if arr[c] > largest:
+                    child, largest = c, arr[c]
+
+        comparisons += 1
+        if arr[child] <= x:
+            break
+        arr[i] = arr[child]
+        i = child
+    arr[i] = x
+    return comparisons
+
+def _sift_to_leaf_and_up(arr, n, d, x):
+    # the root is a hole, x is the element that has to go back into the heap
+    comparisons = 0
+    i = 0
+    while True:
+        child = d * i + 1
+        if child >= n:
+            break
+        if d == 2:
+            if child + 1 < n:
+                comparisons += 1
+                if arr[child + 1] > arr[child]:
+                    child += 1
+        else:
+            last = min(child + d, n)
+            comparisons += last - child - 1
+            largest = arr[child]
+            for c in range(child + 1, last):
+                if arr[c] > largest:
+                    child, largest = c, arr[c]
+
+        arr[i] = arr[child]
+        i = child
+
+    while i > 0:
+        parent = (i - 1) // d
+        comparisons += 1
+        if arr[parent] >= x:
+            break
+        arr[i] = arr[parent]
+        i = parent
+    arr[i] = x
+    return comparisons
+
+def heap_sort_dary_count(arr, d=2):
+    # sorts arr in place and returns the number of element comparisons it made
+    if d < 2:
+        raise ValueError("A heap needs at least 2 children per node.")
+
+    n = len(arr)
+    comparisons = 0
+
+    for i in range((n - 2) // d, -1, -1):
+        comparisons += _sift_down_hole(arr, i, n, d, arr[i])
+
+    for end in range(n - 1, 0, -1):
+        x = arr[end]
+        arr[end] = arr[0]
+        comparisons += _sift_to_leaf_and_up(arr, end, d, x)
+
+    return comparisons
+
+def heap_sort_dary(arr, d=2, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(lambda decorated: heap_sort_dary_count(decorated, d), arr, key, reverse)
+    heap_sort_dary_count(arr, d)
+    return arr
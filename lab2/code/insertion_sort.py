@@ -0,0 +1,13 @@
+def insertion_sort(arr, low=0, high=None):
+    # sorts arr[low..high] in place, the fastest choice for a handful of elements
+    if high is None:
+        high = len(arr) - 1
+
+    for i in range(low + 1, high + 1):
+        key = arr[i]
+        j = i - 1
+        while j >= low and arr[j] > key:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
+    return arr
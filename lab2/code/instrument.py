@@ -0,0 +1,119 @@
+### operation counting for the lab2 sorts
+#
+# CountingArray stands in for the list a sort works on and counts the reads and
+# writes that go through it, CountingKey wraps every element and counts the
+# comparisons, so any sort can be measured without touching its code
+#
+# swaps are not counted, a tuple swap is just two reads and two writes to the array
+#
+# only the array passed in is counted, scratch buffers a sort allocates itself (the
+# merge temp lists, the galloping merge's copy) are plain lists and their reads and
+# writes are left out, so reads and writes are lower bounds for the sorts that use them
+
+# a long run keeps at most this many snapshots, the interval doubles when it fills up
+MAX_SNAPSHOTS = 256
+
+
+class OpCounts:
+    __slots__ = ("comparisons", "reads", "writes")
+
+    def __init__(self):
+        self.comparisons = self.reads = self.writes = 0
+
+    def __repr__(self):
+        return f"OpCounts(comparisons={self.comparisons}, reads={self.reads}, writes={self.writes})"
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CountingKey:
+    __slots__ = ("value", "counts")
+
+    def __init__(self, value, counts: OpCounts):
+        self.value = value
+        self.counts = counts
+
+    def __repr__(self):
+        return repr(self.value)
+
+    def __lt__(self, other):
+        self.counts.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        self.counts.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        self.counts.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        self.counts.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        self.counts.comparisons += 1
+        return self.value == other.value
+
+    def __ne__(self, other):
+        self.counts.comparisons += 1
+        return self.value != other.value
+
+    __hash__ = None
+
+
+class CountingArray:
+    def __init__(self, arr, counts: OpCounts = None, snapshot_every: int = None, max_snapshots: int = MAX_SNAPSHOTS):
+        self._arr = arr
+        self.counts = counts or OpCounts()
+        self.snapshot_every = snapshot_every
+        self.max_snapshots = max_snapshots
+        # (write count, copy of the values) taken every snapshot_every writes
+        self.snapshots = []
+
+    def __len__(self):
+        return len(self._arr)
+
+    def __repr__(self):
+        return f"CountingArray({self._arr!r})"
+
+    def __iter__(self):
+        self.counts.reads += len(self._arr)
+        return iter(self._arr)
+
+    def __getitem__(self, index):
+        values = self._arr[index]
+        self.counts.reads += len(values) if isinstance(index, slice) else 1
+        return values
+
+    def __setitem__(self, index, value):
+        counts = self.counts
+        self._arr[index] = value
+        counts.writes += len(range(*index.indices(len(self._arr)))) if isinstance(index, slice) else 1
+
+        if self.snapshot_every and counts.writes % self.snapshot_every == 0:
+            self._snapshot()
+
+    def _snapshot(self):
+        self.snapshots.append((self.counts.writes, [getattr(v, "value", v) for v in self._arr]))
+        if len(self.snapshots) > self.max_snapshots:
+            # keeps every other snapshot and samples half as often from now on
+            del self.snapshots[::2]
+            self.snapshot_every *= 2
+
+    def copy(self):
+        self.counts.reads += len(self._arr)
+        return self._arr.copy()
+
+    def unwrap(self) -> list:
+        return [getattr(v, "value", v) for v in self._arr]
+
+
+def count_operations(sort_func, data, snapshot_every: int = None):
+    # runs sort_func on a counted copy of data, returns the counts, the sorted values and the snapshots
+    counts = OpCounts()
+    arr = CountingArray([CountingKey(v, counts) for v in data], counts, snapshot_every)
+    sort_func(arr)
+    return counts, arr.unwrap(), arr.snapshots
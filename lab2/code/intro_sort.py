@@ -0,0 +1,109 @@
+from math import log2
+
+from heap_sort import heap_sort_range
+from insertion_sort import insertion_sort
+from merge_sort import merge
+from quick_sort import partition, swap
+
+# partitions this small go to insertion sort
+INSERTION_CUTOFF = 16
+
+# above this size the pivot is the ninther (median of three medians of three)
+NINTHER_CUTOFF = 128
+
+
+def intro_sort(arr):
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    if _merge_runs(arr):
+        return arr
+
+    _intro_sort(arr, 0, n - 1, 2 * int(log2(n)))
+    return arr
+
+
+def _merge_runs(arr):
+    # already sorted, reversed, or made of a few long runs: no partitioning needed
+    n = len(arr)
+    runs = []
+    start = 0
+    max_runs = max(2, int(log2(n)))
+
+    while start < n:
+        end = start + 1
+        if end < n and arr[end] < arr[start]:
+            # descending run, reversed in place
+            while end < n and arr[end] <= arr[end - 1]:
+                end += 1
+            arr[start:end] = arr[start:end][::-1]
+        else:
+            while end < n and arr[end] >= arr[end - 1]:
+                end += 1
+        runs.append((start, end - 1))
+        start = end
+
+        if len(runs) > max_runs:
+            return False
+
+    # pairwise merges of neighbouring runs with the merge sort building block
+    while len(runs) > 1:
+        merged = []
+        for i in range(0, len(runs) - 1, 2):
+            left, mid = runs[i]
+            _, right = runs[i + 1]
+            merge(arr, left, mid, right)
+            merged.append((left, right))
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+
+    return True
+
+
+def _median_of_three(arr, a, b, c):
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+
+def _choose_pivot(arr, low, high):
+    mid = (low + high) // 2
+    if high - low < NINTHER_CUTOFF:
+        return _median_of_three(arr, low, mid, high)
+
+    step = (high - low) // 8
+    return _median_of_three(
+        arr,
+        _median_of_three(arr, low, low + step, low + 2 * step),
+        _median_of_three(arr, mid - step, mid, mid + step),
+        _median_of_three(arr, high - 2 * step, high - step, high),
+    )
+
+
+def _intro_sort(arr, low, high, depth_limit):
+    while high - low + 1 > INSERTION_CUTOFF:
+        if depth_limit == 0:
+            # too many bad pivots, heap sort keeps the worst case at O(n log n)
+            heap_sort_range(arr, low, high)
+            return
+        depth_limit -= 1
+
+        # the chosen pivot is moved to the end, where the lomuto partition expects it
+        swap(arr, _choose_pivot(arr, low, high), high)
+        pi = partition(arr, low, high)
+
+        # recurse into the smaller side and loop on the larger one, the stack stays O(log n)
+        if pi - low < high - pi:
+            _intro_sort(arr, low, pi - 1, depth_limit)
+            low = pi + 1
+        else:
+            _intro_sort(arr, pi + 1, high, depth_limit)
+            high = pi - 1
+
+    insertion_sort(arr, low, high)
@@ -0,0 +1,29 @@
+### key= and reverse= for the lab2 sorts, decorate-sort-undecorate
+#
+# every key is computed once into a (key, index, element) triple, the unique index
+# breaks ties so equal keys keep their input order whatever the algorithm, and the
+# element itself is never compared
+#
+# reverse sorts (key, -index) ascending and reads the result backwards, so equal
+# keys still come out in their input order
+
+
+def sort_with_key(sort_func, arr, key=None, reverse=False):
+    if key is None:
+        key = _identity
+
+    if reverse:
+        decorated = [(key(x), -i, x) for i, x in enumerate(arr)]
+    else:
+        decorated = [(key(x), i, x) for i, x in enumerate(arr)]
+
+    sort_func(decorated)
+
+    if reverse:
+        decorated.reverse()
+    arr[:] = [x for _, _, x in decorated]
+    return arr
+
+
+def _identity(x):
+    return x
@@ -1,101 +1,50 @@
-import matplotlib.pyplot as plt
-import time
+import array
 import random
-import numpy as np
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from common.benchmark import measure
+from common.results import ResultStore
+from instrument import OpCounts, count_operations
+from distributions import FAMILIES, generate_list
+
+OP_NAMES = OpCounts.__slots__
+# the instrumented pass costs about 10x the plain sort, larger sizes are only timed
+COUNT_OPS_MAX_SIZE = 50_000
 
 # Get the directory where the script is executed
 execution_dir = os.getcwd()
 
-# Ensure the 'images/lab' directory exists inside the execution directory for the images
-output_dir = os.path.join(execution_dir, "images", "lab")
-os.makedirs(output_dir, exist_ok=True)
+# every measurement of this run goes to the shared results store
+results_run = ResultStore().start_run("lab2")
+
+def sort_performance_analyzer(sort_func, sample_sizes=[10, 100, 300, 700], seed=None, count_ops=False,
+                              array_types=["random", "sorted", "partially_sorted"]):
+    # array_types are families of distributions.FAMILIES, a seeded array is loaded from the .npy cache
 
-def sort_performance_analyzer(sort_func, sample_sizes=[10, 100, 300, 700]):
-    array_types = ["random", "sorted", "partially_sorted"]
-    colors = ["#eb9191", "#91ebcf", "#919eeb"]
-    
-    def random_array(n):
-        return [random.randint(1, 1_000_000) for _ in range(n)]
-    
-    def swap_every_nth(arr, step=5):
-        arr = arr[:]
-        for i in range(0, len(arr) - step, step):
-            arr[i], arr[i + step - 1] = arr[i + step - 1], arr[i]
-        return arr
-    
     results = {
         "times": {array_type: [] for array_type in array_types},
+        "counts": {array_type: [] for array_type in array_types},
         "sample_sizes": sample_sizes
     }
     
     for size in sample_sizes:
-        arrays = {
-            "random": random_array(size),
-            "sorted": sorted(random_array(size)),
-            "partially_sorted": swap_every_nth(sorted(random_array(size)), max(5, size // 20))
-        }
+        arrays = {array_type: generate_list(array_type, size, seed) for array_type in array_types}
         
         for array_type in array_types:
-            start = time.time()
-            sort_func(arrays[array_type].copy())
-            execution_time = time.time() - start
-            results["times"][array_type].append(execution_time)
-    
-    # Save plot to the 'images/lab' directory
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    x_positions = sample_sizes
-    rects = []
-    bar_width = min(np.diff(x_positions)) * 0.25 if len(x_positions) > 1 else x_positions[0] * 0.25
-    
-    for i, array_type in enumerate(array_types):
-        offset = (i - (len(array_types) - 1) / 2) * bar_width
-        positions = [x + offset for x in x_positions]
-        
-        rect = ax.bar(
-            positions,
-            results["times"][array_type],
-            bar_width,
-            label=f'{array_type.replace("_", " ").title()} Array',
-            color=colors[i]
-        )
-        rects.append(rect)
-    
-    title = f"{sort_func.__name__.replace('_', ' ').title()} Performance by Array Type and Size"
-    ax.set_xlabel('Array Size', fontweight='bold')
-    ax.set_ylabel('Execution Time (seconds)', fontweight='bold')
-    ax.set_title(title, fontweight='bold')
-    ax.set_xticks(x_positions)
-    ax.set_xticklabels([f"{size:,}" for size in sample_sizes])
-
-    if max(sample_sizes) / min(sample_sizes) > 50:
-        ax.set_xscale('log')
-        ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{int(x):,}"))
-    
-    ax.legend()
-    ax.grid(True, linestyle='--', alpha=0.7)
-    ax.set_facecolor("#424c51")
-    fig.patch.set_facecolor('white')
-
-    def autolabel(rects):
-        for rect in rects:
-            height = rect.get_height()
-            ax.annotate(
-                f'{height:.4f}',
-                xy=(rect.get_x() + rect.get_width() / 2, height),
-                xytext=(0, 3),
-                textcoords="offset points",
-                ha='center', va='bottom',
-                color='white', fontsize=8
-            )
-    
-    for rect in rects:
-        autolabel(rect)
+            # every run sorts a fresh copy, the copy itself is not timed
+            timing = measure(sort_func, setup=lambda: (arrays[array_type].copy(),))
+            results["times"][array_type].append(timing.median)
+
+            # operation counts come from one extra instrumented run, outside the timing
+            counted = count_ops and size <= COUNT_OPS_MAX_SIZE
+            counts = count_operations(sort_func, arrays[array_type])[0].as_dict() if counted else {}
+            results["counts"][array_type].append(counts)
+            results_run.record(sort_func.__name__, array_type, size, timing, seed=seed, **counts)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, f"{sort_func.__name__}.png"))
-    plt.show()
+    # only raw results here, the charts are drawn by the report stage (python -m common.report)
 
     # Generate file name based on function name (first letters of each word, ignoring underscores)
     short_name = "".join(word[0] for word in sort_func.__name__.split("_"))
@@ -119,21 +68,218 @@ def sort_performance_analyzer(sort_func, sample_sizes=[10, 100, 300, 700]):
                 *[f"{time:.6f}" for time in row[1:]]
             ) + "\n")
 
+        if count_ops:
+            f.write(f"\n{algorithm_name} Operation Counts:\n\n")
+            count_format = "{:<15}{:<20}" + "{:<15}" * len(OP_NAMES)
+            f.write(count_format.format("Array Size", "Array Type", *[name.title() for name in OP_NAMES]) + "\n")
+            f.write("-" * (35 + 15 * len(OP_NAMES)) + "\n")
+
+            for i, size in enumerate(sample_sizes):
+                for array_type in array_types:
+                    counts = results["counts"][array_type][i]
+                    if not counts:
+                        continue
+                    f.write(count_format.format(
+                        size, array_type, *[counts[name] for name in OP_NAMES]
+                    ) + "\n")
+
     return results
 
+def compare_heap_sorts(size=200_000, arities=None, seed=None):
+    # wall time and comparison count of every d-ary heap against the recursive heap_sort
+    if seed is not None:
+        random.seed(seed)
+
+    arities = arities or HEAP_ARITIES
+    data = [random.randint(1, 1_000_000) for _ in range(size)]
+
+    print(f"{'Variant':<15}{'Comparisons':>15}{'Time (s)':>15}")
+    print("-" * 45)
+
+    timing = measure(heap_sort, setup=lambda: (data.copy(),))
+    results_run.record("heap_sort", "random_arity", size, timing, seed=seed)
+    print(f"{'heap_sort':<15}{'-':>15}{timing.median:>15.6f}")
+
+    for d in arities:
+        comparisons = heap_sort_dary_count(data.copy(), d)
+        timing = measure(heap_sort_dary_count, setup=lambda: (data.copy(), d))
+        results_run.record(f"heap_sort_d{d}", "random_arity", size, timing, seed=seed, comparisons=comparisons)
+        print(f"{f'd = {d}':<15}{comparisons:>15,}{timing.median:>15.6f}")
+
+def compare_typed_sorts(sample_sizes=[100_000, 1_000_000, 10_000_000], seed=None):
+    # 64-bit keys in contiguous buffers against list.sort on boxed ints and np.sort
+    import numpy as np
+    from typed_sort import radix_sort, merge_sort_typed
+
+    rng = np.random.default_rng(seed)
+    sorts = {
+        "list_sort": (list.sort, lambda keys: keys.tolist()),
+        "np_sort": (np.ndarray.sort, lambda keys: keys.copy()),
+        "radix_sort": (radix_sort, lambda keys: array.array("q", keys.tobytes())),
+        "merge_sort_typed": (merge_sort_typed, lambda keys: array.array("q", keys.tobytes())),
+    }
+
+    print(f"{'Array Size':<15}" + "".join(f"{name:<20}" for name in sorts))
+    print("-" * (15 + 20 * len(sorts)))
+
+    for size in sample_sizes:
+        keys = rng.integers(-2**63, 2**63 - 1, size, dtype=np.int64)
+        row = []
+        for name, (sort_func, prepare) in sorts.items():
+            timing = measure(sort_func, setup=lambda: (prepare(keys),), warmup=0)
+            results_run.record(name, "random_int64", size, timing, seed=seed)
+            row.append(timing.median)
+        print(f"{size:<15}" + "".join(f"{t:<20.6f}" for t in row))
+
+def compare_parallel_sorts(sample_sizes=[1_000_000, 10_000_000], worker_counts=[1, 2, 4, 8], method="sample", leaf="merge_sort", seed=None):
+    # speedup of the shared-memory parallel sort over its own leaf sort run on one core
+    from concurrent.futures import ProcessPoolExecutor
+    from parallel_sort import parallel_sort
+
+    if seed is not None:
+        random.seed(seed)
+
+    print(f"{'Array Size':<15}" + "".join(f"{f'{w} workers':<20}" for w in worker_counts))
+    print("-" * (15 + 20 * len(worker_counts)))
+
+    for size in sample_sizes:
+        data = [random.randint(-2**63, 2**63 - 1) for _ in range(size)]
+        row = []
+        serial = None
+        for workers in worker_counts:
+            # the pool is started before timing so the speedup is not eaten by process startup
+            with ProcessPoolExecutor(workers) as executor:
+                timing = measure(
+                    lambda arr: parallel_sort(arr, workers, leaf, method, executor),
+                    setup=lambda: (data.copy(),), warmup=0, min_repeat=1
+                )
+            serial = serial or timing.median
+            results_run.record(f"parallel_{method}_sort", f"workers={workers}", size, timing, seed=seed,
+                               leaf=leaf, speedup=serial / timing.median)
+            row.append(f"{timing.median:.3f}s x{serial / timing.median:.2f}")
+        print(f"{size:<15}" + "".join(f"{cell:<20}" for cell in row))
+
+def benchmark_external_sort(sample_sizes=[1_000_000, 5_000_000], memory_budget=16 * 1024 * 1024, fan_in=8, seed=None):
+    # throughput of the out-of-core sort in MB/s of input, for both file formats and readers
+    import tempfile
+    from external_sort import external_sort, FORMATS, READERS
+
+    if seed is not None:
+        random.seed(seed)
+
+    print(f"{'Array Size':<15}{'Format':<10}{'Reader':<12}{'Runs':>6}{'Time (s)':>12}{'MB/s':>10}")
+    print("-" * 65)
+
+    with tempfile.TemporaryDirectory(prefix="lab2_external_") as work_dir:
+        for size in sample_sizes:
+            keys = array.array("q", (random.randint(-2**63, 2**63 - 1) for _ in range(size)))
+            inputs = {"binary": os.path.join(work_dir, "input.bin"), "text": os.path.join(work_dir, "input.txt")}
+            with open(inputs["binary"], "wb") as f:
+                keys.tofile(f)
+            with open(inputs["text"], "w") as f:
+                f.write("\n".join(map(str, keys)) + "\n")
+            del keys
+
+            for fmt in FORMATS:
+                for reader in READERS:
+                    output = os.path.join(work_dir, f"output.{fmt}")
+                    stats = {}
+                    timing = measure(
+                        lambda: stats.update(external_sort(inputs[fmt], output, fmt, memory_budget, fan_in, reader=reader, tmp_dir=work_dir)),
+                        warmup=0, min_repeat=1
+                    )
+                    throughput = stats["bytes"] / timing.median / 2**20
+                    results_run.record("external_sort", f"{fmt}_{reader}", size, timing, seed=seed,
+                                       runs=stats["runs"], mb_per_s=throughput)
+                    print(f"{size:<15}{fmt:<10}{reader:<12}{stats['runs']:>6}{timing.median:>12.3f}{throughput:>10.2f}")
+
+class _KeyOnCompare:
+    # the naive way to sort by a key, the key is computed again on every comparison
+    __slots__ = ("item", "key")
+
+    def __init__(self, item, key):
+        self.item = item
+        self.key = key
+
+    def __lt__(self, other):
+        return self.key(self.item) < other.key(other.item)
+
+    def __gt__(self, other):
+        return self.key(self.item) > other.key(other.item)
+
+    def __le__(self, other):
+        return self.key(self.item) <= other.key(other.item)
+
+    def __ge__(self, other):
+        return self.key(self.item) >= other.key(other.item)
+
+def compare_key_sorts(size=20_000, seed=None):
+    # decorate-sort-undecorate against recomputing an expensive key in every comparison
+    if seed is not None:
+        random.seed(seed)
+
+    first_names = ["Ana", "Ion", "Maria", "Victor", "Elena", "Timur", "Olga", "Dan"]
+    last_names = ["Popescu", "Rusu", "Ceban", "Lungu", "Munteanu", "Cravtov", "Rotari"]
+    records = [
+        (f"{random.choice(first_names)} {random.choice(last_names)}", random.randint(1, 100), f"DEPT-{random.randint(1, 50):03d}")
+        for _ in range(size)
+    ]
+
+    def key(record):
+        # string splitting and a tuple per call, department first, then last name
+        return (int(record[2].split("-")[1]), record[0].split()[-1].lower())
+
+    print(f"{'Sort':<25}{'Key on compare (s)':>20}{'Decorated (s)':>20}")
+    print("-" * 65)
+
+    for sort_func in (quick_sort, merge_sort, merge_sort_bottom_up, heap_sort, comb_sort):
+        naive = measure(sort_func, setup=lambda: ([_KeyOnCompare(r, key) for r in records],), warmup=0, min_repeat=1)
+        decorated = measure(lambda arr: sort_func(arr, key=key), setup=lambda: (records.copy(),), warmup=0, min_repeat=1)
+        results_run.record(sort_func.__name__, "key_on_compare", size, naive, seed=seed)
+        results_run.record(sort_func.__name__, "decorated_key", size, decorated, seed=seed)
+        print(f"{sort_func.__name__:<25}{naive.median:>20.6f}{decorated.median:>20.6f}")
+
 from bubble_sort import bubble_sort
-from heap_sort import heap_sort
+from heap_sort import heap_sort, heap_sort_dary, heap_sort_dary_count, HEAP_ARITIES
 from quick_sort import quick_sort
-from merge_sort import merge_sort
-from bubble_sort_impr import bubble_sort_impr
+from merge_sort import merge_sort, merge_sort_bottom_up
+from bubble_sort_impr import bubble_sort_impr, bubble_sort_adaptive, comb_sort
+from intro_sort import intro_sort
+
+if __name__ == "__main__":
+
+    # sort_performance_analyzer(bubble_sort_impr, sample_sizes=[300, 600, 700, 3000, 5000])
+
+    # comb and cocktail passes picked by presortedness, past the ~5k where plain bubble sort gives up
+    sort_performance_analyzer(bubble_sort_adaptive, sample_sizes=[1000, 10_000, 50_000, 100_000], seed=42, count_ops=True)
+
+    # sort_performance_analyzer(merge_sort, sample_sizes=[1000, 10_000, 20_000, 50_000, 200_000])
+
+    sort_performance_analyzer(heap_sort, sample_sizes=[1000, 10_000, 20_000, 50_000, 200_000], seed=42, count_ops=True)
+
+    # hole-based sift-down on binary, 4-ary and 8-ary heaps, on the 200k array
+    compare_heap_sorts(200_000)
+    sort_performance_analyzer(heap_sort_dary, sample_sizes=[1000, 10_000, 20_000, 50_000, 200_000], seed=42)
 
-# sort_performance_analyzer(bubble_sort_impr, sample_sizes=[300, 600, 700, 3000, 5000])
+    # natural runs and galloping make the sorted and partially sorted families close to O(n)
+    sort_performance_analyzer(merge_sort_bottom_up, sample_sizes=[1000, 10_000, 20_000, 50_000, 200_000], seed=42)
 
-# sort_performance_analyzer(merge_sort, sample_sizes=[1000, 10_000, 20_000, 50_000, 200_000])
+    # quick_sort hits the recursion limit on sorted input around 1000 elements, the hybrid goes to 10^6
+    sort_performance_analyzer(intro_sort, sample_sizes=[1000, 10_000, 100_000, 1_000_000], seed=42)
 
-sort_performance_analyzer(heap_sort, sample_sizes=[1000, 10_000, 20_000, 50_000, 200_000])
+    # every input family, including the adversarial ones, on the hybrid sort
+    sort_performance_analyzer(intro_sort, sample_sizes=[20_000, 200_000], seed=42, array_types=list(FAMILIES))
 
+    # keys computed once per element instead of once per comparison
+    compare_key_sorts(seed=42)
 
+    # typed buffers reach 10^7 keys without a Python object per element
+    compare_typed_sorts(seed=42)
 
+    # speedup curves against the worker count, the first count is the baseline
+    compare_parallel_sorts(seed=42)
 
+    # out-of-core sort with a 16 MB budget, so every size spills several runs
+    benchmark_external_sort(seed=42)
 
+    print(f"timings stored as run {results_run.run_id}, render them with: python -m common.report --run {results_run.run_id}")
@@ -1,3 +1,5 @@
+from key_sort import sort_with_key
+
 def merge(arr, left, mid, right):
     n1 = mid - left + 1
     n2 = right - mid
@@ -42,8 +44,11 @@ def merge(arr, left, mid, right):
         k += 1
 
     
-def merge_sort(arr: list):
+def merge_sort(arr: list, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(merge_sort, arr, key, reverse)
     _merge_sort(arr, 0, len(arr) - 1)
+    return arr
 
 def _merge_sort(arr, left, right):
     if left < right:
@@ -53,3 +58,129 @@ def _merge_sort(arr, left, right):
         _merge_sort(arr, mid + 1, right)
         merge(arr, left, mid, right)
         
+
+
+### bottom-up natural merge sort, one auxiliary buffer for the whole sort
+
+from bisect import bisect_left, bisect_right
+
+# natural runs shorter than this are extended with binary insertion first
+MIN_RUN = 32
+
+# after this many wins in a row from one side, the rest of its winners are found by binary search
+MIN_GALLOP = 7
+
+
+def merge_sort_bottom_up(arr: list, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(merge_sort_bottom_up, arr, key, reverse)
+
+    n = len(arr)
+    if n < 2:
+        return arr
+
+    runs = _find_runs(arr)
+    if len(runs) == 1:
+        return arr
+
+    # the buffer is allocated once, source and destination swap roles after every pass
+    buffer = [None] * n
+    src, dst = arr, buffer
+
+    while len(runs) > 1:
+        merged = []
+        for i in range(0, len(runs) - 1, 2):
+            lo, mid = runs[i]
+            _, hi = runs[i + 1]
+            _gallop_merge(src, dst, lo, mid, hi)
+            merged.append((lo, hi))
+        if len(runs) % 2:
+            lo, hi = runs[-1]
+            dst[lo:hi] = src[lo:hi]
+            merged.append((lo, hi))
+
+        runs = merged
+        src, dst = dst, src
+
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+
+def _find_runs(arr):
+    # (start, end) pairs, end exclusive
+    n = len(arr)
+    runs = []
+    start = 0
+
+    while start < n:
+        end = start + 1
+        if end < n and arr[end] < arr[start]:
+            # only strictly descending runs are reversed, so equal elements keep their order
+            while end < n and arr[end] < arr[end - 1]:
+                end += 1
+            arr[start:end] = arr[start:end][::-1]
+        else:
+            while end < n and arr[end] >= arr[end - 1]:
+                end += 1
+
+        if end - start < MIN_RUN and end < n:
+            forced = min(n, start + MIN_RUN)
+            _binary_insertion(arr, start, end, forced)
+            end = forced
+
+        runs.append((start, end))
+        start = end
+
+    return runs
+
+
+def _binary_insertion(arr, lo, sorted_end, hi):
+    # arr[lo:sorted_end] is already sorted, insert the rest of arr[lo:hi] one by one
+    for i in range(sorted_end, hi):
+        x = arr[i]
+        pos = bisect_right(arr, x, lo, i)
+        arr[pos + 1:i + 1] = arr[pos:i]
+        arr[pos] = x
+
+
+def _gallop_merge(src, dst, lo, mid, hi):
+    # merges src[lo:mid] and src[mid:hi] into dst[lo:hi]
+    if src[mid - 1] <= src[mid]:
+        dst[lo:hi] = src[lo:hi]
+        return
+
+    i, j, k = lo, mid, lo
+    left_wins = right_wins = 0
+
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+            k += 1
+            right_wins += 1
+            left_wins = 0
+
+            if right_wins >= MIN_GALLOP and j < hi:
+                end = bisect_left(src, src[i], j, hi)
+                dst[k:k + end - j] = src[j:end]
+                k += end - j
+                j = end
+                right_wins = 0
+        else:
+            dst[k] = src[i]
+            i += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+
+            if left_wins >= MIN_GALLOP and i < mid:
+                end = bisect_right(src, src[j], i, mid)
+                dst[k:k + end - i] = src[i:end]
+                k += end - i
+                i = end
+                left_wins = 0
+
+    dst[k:k + mid - i] = src[i:mid]
+    k += mid - i
+    dst[k:k + hi - j] = src[j:hi]
@@ -0,0 +1,138 @@
+import array
+import bisect
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from merge_sort import merge_sort
+from quick_sort import quick_sort
+
+### parallel sort over shared memory
+#
+# the keys are copied once into a shared int64 buffer, the workers attach to it
+# by name and only ever send back a handful of samples, so nothing big is pickled
+#
+#   "merge"  - every worker sorts one chunk, the parent does a k-way heap merge
+#   "sample" - parallel sorting by regular sampling (PSRS), the chunks are split at
+#              common pivots and every worker merges one partition into the output
+
+LEAF_SORTS = {
+    "merge_sort": merge_sort,
+    "quick_sort": quick_sort,
+}
+METHODS = ("merge", "sample")
+
+# below this many keys the process startup costs more than it saves
+PARALLEL_CUTOFF = 10_000
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _fits_int64(arr):
+    # the shared buffer holds int64, anything else (floats, big ints, bools, strings) would
+    # be rejected or silently converted, so it is sorted serially instead
+    return all(type(x) is int for x in arr) and _INT64_MIN <= min(arr) and max(arr) <= _INT64_MAX
+
+
+def _attach(name, n):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, shm.buf[:8 * n].cast("q")
+
+
+def _detach(shm, view):
+    # the views have to be released before the mapping can be closed
+    view.release()
+    shm.close()
+
+
+def _sort_chunk(name, n, low, high, leaf, samples):
+    shm, view = _attach(name, n)
+    try:
+        chunk = view[low:high].tolist()
+        LEAF_SORTS[leaf](chunk)
+        view[low:high] = array.array("q", chunk)
+        # regular samples for picking the PSRS pivots
+        return [chunk[i * len(chunk) // samples] for i in range(samples)] if chunk else []
+    finally:
+        _detach(shm, view)
+
+
+def _merge_partition(src_name, dst_name, n, segments, offset):
+    src, src_view = _attach(src_name, n)
+    dst, dst_view = _attach(dst_name, n)
+    try:
+        pieces = [src_view[low:high].tolist() for low, high in segments if low < high]
+        merged = array.array("q", heapq.merge(*pieces))
+        dst_view[offset:offset + len(merged)] = merged
+    finally:
+        _detach(src, src_view)
+        _detach(dst, dst_view)
+
+
+def _chunk_bounds(n, parts):
+    return [(i * n // parts, (i + 1) * n // parts) for i in range(parts)]
+
+
+def parallel_sort(arr: list, workers=None, leaf="merge_sort", method="sample", executor=None):
+    if leaf not in LEAF_SORTS:
+        raise ValueError(f"Unknown leaf sort '{leaf}', expected one of {tuple(LEAF_SORTS)}.")
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}.")
+
+    # a passed-in executor does not say how many workers it has, workers sets the chunk count
+    workers = workers or os.cpu_count()
+    n = len(arr)
+    if workers == 1 or n < PARALLEL_CUTOFF or not _fits_int64(arr):
+        LEAF_SORTS[leaf](arr)
+        return arr
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(workers)
+
+    src = shared_memory.SharedMemory(create=True, size=8 * n)
+    dst = shared_memory.SharedMemory(create=True, size=8 * n) if method == "sample" else None
+    src_view = src.buf[:8 * n].cast("q")
+    try:
+        src_view[:] = array.array("q", arr)
+        chunks = _chunk_bounds(n, workers)
+
+        futures = [executor.submit(_sort_chunk, src.name, n, low, high, leaf, workers) for low, high in chunks]
+        samples = [future.result() for future in futures]
+
+        if method == "merge":
+            arr[:] = heapq.merge(*(src_view[low:high].tolist() for low, high in chunks))
+            return arr
+
+        # workers - 1 pivots taken at regular intervals of the sorted samples
+        samples = sorted(sample for chunk_samples in samples for sample in chunk_samples)
+        pivots = [samples[i * workers + workers // 2 - 1] for i in range(1, workers)]
+
+        # cuts[c][j] is where partition j starts inside chunk c
+        cuts = [
+            [low] + [bisect.bisect_right(src_view, pivot, low, high) for pivot in pivots] + [high]
+            for low, high in chunks
+        ]
+
+        futures = []
+        offset = 0
+        for j in range(workers):
+            segments = [(cut[j], cut[j + 1]) for cut in cuts]
+            futures.append(executor.submit(_merge_partition, src.name, dst.name, n, segments, offset))
+            offset += sum(high - low for low, high in segments)
+        for future in futures:
+            future.result()
+
+        dst_view = dst.buf[:8 * n].cast("q")
+        arr[:] = dst_view.tolist()
+        dst_view.release()
+        return arr
+    finally:
+        src_view.release()
+        for shm in (src, dst):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        if own_executor:
+            executor.shutdown()
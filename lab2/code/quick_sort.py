@@ -1,3 +1,5 @@
+from key_sort import sort_with_key
+
 def partition(arr, low, high):
     
     pivot = arr[high]
@@ -16,8 +18,11 @@ def swap(arr, i, j):
     arr[i], arr[j] = arr[j], arr[i]
 
 
-def quick_sort(arr):
+def quick_sort(arr, key=None, reverse=False):
+    if key is not None or reverse:
+        return sort_with_key(quick_sort, arr, key, reverse)
     _quick_sort(arr, 0, len(arr) - 1)
+    return arr
 
 def _quick_sort(arr, low, high ):
     if low < high:
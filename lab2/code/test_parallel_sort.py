@@ -0,0 +1,23 @@
+import random
+
+from parallel_sort import PARALLEL_CUTOFF, parallel_sort
+
+
+def test_float_list_above_cutoff_is_sorted_serially():
+    arr = [random.uniform(-1e6, 1e6) for _ in range(PARALLEL_CUTOFF + 1)]
+    expected = sorted(arr)
+    assert parallel_sort(arr, workers=2) == expected
+    assert all(type(x) is float for x in arr)
+
+
+def test_big_ints_above_cutoff_are_not_truncated():
+    arr = [random.randint(0, 1 << 70) for _ in range(PARALLEL_CUTOFF + 1)]
+    expected = sorted(arr)
+    assert parallel_sort(arr, workers=2) == expected
+
+
+def test_int64_list_above_cutoff_matches_sorted():
+    arr = [random.randint(-(1 << 63), (1 << 63) - 1) for _ in range(PARALLEL_CUTOFF * 2)]
+    expected = sorted(arr)
+    for method in ("merge", "sample"):
+        assert parallel_sort(arr.copy(), workers=2, method=method) == expected
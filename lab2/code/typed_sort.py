@@ -0,0 +1,137 @@
+import array
+
+import numpy as np
+
+### typed sorting path for homogeneous 64-bit integer keys
+#
+# array('q'), int64 memoryviews and int64 ndarrays are sorted straight on their
+# buffer, numpy views the same memory so no per-element Python object is ever made
+
+# bits of the key handled by one LSD pass, 16 gives four passes over int64
+RADIX_BITS = 16
+# block width sorted at the leaves of merge_sort_typed before merging starts
+MERGE_LEAF = 1024
+
+_SIGN = np.uint64(1 << 63)
+
+
+def as_int64(buf):
+    # a writable int64 ndarray over the memory of buf, never a copy
+    if isinstance(buf, np.ndarray):
+        view = buf
+    elif isinstance(buf, array.array):
+        # array('Q') is rejected, unsigned keys past 2**63 would sort as negative int64
+        if buf.typecode != "q":
+            raise TypeError(f"array('{buf.typecode}') is not a 64-bit integer array, expected array('q').")
+        view = np.frombuffer(buf, dtype=np.int64)
+    elif isinstance(buf, memoryview):
+        if buf.format not in ("q", "l") or buf.itemsize != 8:
+            raise TypeError(f"memoryview of format '{buf.format}' is not a 64-bit integer buffer.")
+        view = np.asarray(buf)
+    else:
+        raise TypeError(f"{type(buf).__name__} is not a typed buffer, expected array('q'), memoryview or np.ndarray.")
+
+    if view.dtype != np.int64 or view.ndim != 1:
+        raise TypeError(f"expected a one-dimensional int64 buffer, got {view.ndim}-d {view.dtype}.")
+    if not view.flags.c_contiguous or not view.flags.writeable:
+        raise ValueError("The buffer must be contiguous and writable to be sorted in place.")
+    return view
+
+
+### LSD radix sort
+
+def radix_sort(buf, bits=RADIX_BITS):
+    keys = as_int64(buf)
+    n = len(keys)
+    if n < 2:
+        return buf
+
+    # flipping the sign bit in place orders negative keys before positive ones as unsigned
+    unsigned = keys.view(np.uint64)
+    unsigned ^= _SIGN
+    mask = np.uint64((1 << bits) - 1)
+    digit_type = np.uint8 if bits <= 8 else np.uint16 if bits <= 16 else np.uint32
+
+    # the passes ping-pong between the buffer and one scratch array, the digits and
+    # the shifted keys also reuse their arrays, only argsort's order is new every pass
+    src, dst = unsigned, np.empty_like(unsigned)
+    shifted = np.empty_like(unsigned)
+    digits = np.empty(n, dtype=digit_type)
+
+    for shift in range(0, 64, bits):
+        np.right_shift(src, np.uint64(shift), out=shifted)
+        np.bitwise_and(shifted, mask, out=shifted)
+        np.copyto(digits, shifted, casting="unsafe")
+        # a pass where every key has the same digit would not move anything
+        if digits.min() == digits.max():
+            continue
+        # numpy's stable sort of small unsigned ints is itself a counting sort
+        np.take(src, np.argsort(digits, kind="stable"), out=dst)
+        src, dst = dst, src
+
+    if src is not unsigned:
+        unsigned[:] = src
+    unsigned ^= _SIGN
+    return buf
+
+
+### vectorised merge
+
+def merge_sorted(a, b, out=None):
+    # stable merge of two sorted int64 arrays, equal keys of a come first
+    a, b = np.asarray(a), np.asarray(b)
+    if out is None:
+        out = np.empty(len(a) + len(b), dtype=np.result_type(a, b))
+
+    # every element of b lands after the elements of a that are <= it and after the earlier b's
+    b_pos = np.searchsorted(a, b, side="right")
+    b_pos += np.arange(len(b))
+    is_a = np.ones(len(out), dtype=bool)
+    is_a[b_pos] = False
+
+    out[b_pos] = b
+    out[is_a] = a
+    return out
+
+
+def merge_sort_typed(buf, leaf=MERGE_LEAF):
+    keys = as_int64(buf)
+    n = len(keys)
+    if n < 2:
+        return buf
+
+    # all full leaves are sorted by one call over a 2-d view of the buffer, then the tail
+    full = n - n % leaf
+    if full:
+        keys[:full].reshape(-1, leaf).sort(axis=1)
+    keys[full:].sort()
+
+    # bottom-up passes ping-pong between the buffer and one scratch array
+    src, dst = keys, np.empty_like(keys)
+    width = leaf
+    while width < n:
+        for low in range(0, n, 2 * width):
+            mid = min(low + width, n)
+            high = min(low + 2 * width, n)
+            if mid == high:
+                dst[low:high] = src[low:high]
+            else:
+                merge_sorted(src[low:mid], src[mid:high], dst[low:high])
+        src, dst = dst, src
+        width *= 2
+
+    if src is not keys:
+        keys[:] = src
+    return buf
+
+
+TYPED_SORTS = {
+    "radix": radix_sort,
+    "merge": merge_sort_typed,
+}
+
+
+def typed_sort(buf, method="radix"):
+    if method not in TYPED_SORTS:
+        raise ValueError(f"Unknown method '{method}', expected one of {tuple(TYPED_SORTS)}.")
+    return TYPED_SORTS[method](buf)
@@ -5,56 +5,70 @@ import matplotlib.animation as animation
 
 
 from bubble_sort import bubble_sort
-from quick_sort import quick_sort 
+from quick_sort import quick_sort
 from merge_sort import merge_sort
 from heap_sort import heap_sort
 
 import random
-import queue
 
-# Shared state
-array_updates = queue.Queue()  # Queue to pass array updates to the main thread
-sorting_complete = threading.Event()  # Event to signal when sorting is complete
-
-# Time diff in milliseconds
-def visualize_sorting(array, time_diff, sorting_func):
+# Time diff in milliseconds, it is the frame interval and no longer slows the sort down
+#
+# the sort thread only records the latest value of every written index, every frame
+# swaps those pending writes out and redraws just the changed bars, so the memory is
+# at most one entry per element and each frame shows the array as it is right now
+def visualize_sorting(array, time_diff, sorting_func, write_delay=0):
     function_title = sorting_func.__name__
 
+    pending = {}
+    # held only for a dict store or a swap, the sort thread never waits on a redraw
+    lock = threading.Lock()
+    sorting_complete = threading.Event()
+
     def visualize():
         fig, ax = plt.subplots(figsize=(15, 8))
-        ax.set_title(function_title.replace("_", " ").title())  
+        ax.set_title(function_title.replace("_", " ").title())
         bars = ax.bar(range(len(array)), array, color='#eb9191')
         ax.set_facecolor("#424c51")
 
         def update_fig(frame):
-            try:
-                # Get the latest array from the queue
-                new_array = array_updates.get_nowait()
-                for bar, height in zip(bars, new_array):
-                    bar.set_height(height)
-            except queue.Empty:
-                pass  # No update available
-            return bars
-
-        ani = animation.FuncAnimation(fig, update_fig, interval=time_diff, blit=True, cache_frame_data=False)
+            nonlocal pending
+            # read before the swap, so writes made after the flag are still in this batch
+            complete = sorting_complete.is_set()
+            with lock:
+                changed, pending = pending, {}
+
+            for index, value in changed.items():
+                bars[index].set_height(value)
+
+            if complete:
+                ani.event_source.stop()
+            return [bars[index] for index in changed]
+
+        # the initial draw shows the bars as they are, update_fig only runs once ani exists
+        ani = animation.FuncAnimation(
+            fig, update_fig, init_func=lambda: bars.patches, interval=time_diff, blit=True, cache_frame_data=False
+        )
         plt.show()
 
-    def on_array_change(new_array):
+    def on_array_change(index, value):
+        with lock:
+            pending[index] = value
 
-        array_updates.put(new_array.copy())
+    monitored_array = MonitoredArray(array.copy(), on_array_change, write_delay)
 
-    monitored_array = MonitoredArray(array.copy(), on_array_change, time_diff)
+    def sort():
+        sorting_func(monitored_array)
+        sorting_complete.set()
 
-    sorting_thread = threading.Thread(target=sorting_func, args=(monitored_array,))
+    sorting_thread = threading.Thread(target=sort, daemon=True)
     sorting_thread.start()
 
     visualize()
 
     sorting_thread.join()
-    sorting_complete.set() 
 
 class MonitoredArray:
-    def __init__(self, arr, callback, time_diff):
+    def __init__(self, arr, callback, time_diff=0):
         self._arr = arr
         self._callback = callback
         self._time_diff = time_diff / 1000  # milliseconds to seconds
@@ -64,8 +78,14 @@ class MonitoredArray:
 
     def __setitem__(self, index, value):
         self._arr[index] = value
-        self._callback(self._arr) 
-        time.sleep(self._time_diff) 
+        if isinstance(index, slice):
+            # one delta per element the slice assignment touched
+            for i in range(*index.indices(len(self._arr))):
+                self._callback(i, self._arr[i])
+        else:
+            self._callback(index % len(self._arr), value)
+        if self._time_diff:
+            time.sleep(self._time_diff)
 
     def __len__(self):
         return len(self._arr)
@@ -79,7 +99,8 @@ class MonitoredArray:
     def copy(self):
         return self._arr.copy()
 
-sorting_array = [random.randint(1, 200) for _ in range(20)]
+if __name__ == "__main__":
 
+    sorting_array = [random.randint(1, 200) for _ in range(2000)]
 
-visualize_sorting(sorting_array, 100, quick_sort)
\ No newline at end of file
+    visualize_sorting(sorting_array, 30, quick_sort)
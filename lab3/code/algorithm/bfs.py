@@ -1,22 +1,146 @@
 import networkx as nx
-import matplotlib.pyplot as plt
-import random
-import time
+from collections import deque
+
+# direction-optimising switch points (Beamer et al.), bottom-up once the frontier's
+# edges pass 1/ALPHA of the unexplored edges, top-down again when the frontier
+# shrinks under 1/BETA of the nodes
+ALPHA = 14
+BETA = 24
 
 
 def bfs(graph: nx.Graph, start_node: int) -> list:
     """Perform BFS on the graph starting from the given node."""
-    visited = set()
-    queue = [start_node]
+    if getattr(graph, "is_csr", False):
+        return _bfs_csr(graph, start_node)
+
+    # marked when queued, every node enters the queue once and the order is unchanged
+    visited = {start_node}
+    queue = deque([start_node])
     bfs_order = []
 
     while queue:
-        node = queue.pop(0)
-        if node not in visited:
-            visited.add(node)
-            bfs_order.append(node)
-            # Add neighbors to queue
-            queue.extend(graph.neighbors(node))
+        node = queue.popleft()
+        bfs_order.append(node)
+        for neighbor in graph.neighbors(node):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
 
     return bfs_order
 
+
+def _bfs_csr(graph, start_node) -> list:
+    indptr, indices = graph.indptr, graph.indices
+    start = graph.id_of(start_node)
+
+    # marked when queued, so the order list is the queue as well
+    visited = bytearray(graph.number_of_nodes())
+    visited[start] = 1
+    order = [start]
+    for node in order:
+        for neighbor in indices[indptr[node]:indptr[node + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                order.append(neighbor)
+
+    labels = graph.labels
+    return [labels[node] for node in order]
+
+
+### BFS engine, order together with the distances and the BFS tree
+
+def bfs_tree(graph, start_node, direction_optimizing: bool = False):
+    """Return (order, distances, parents), the start node is its own parent.
+
+    direction_optimizing lets a CSR graph expand a large frontier bottom-up, the nodes
+    of such a level are then visited in id order instead of queue order.
+    """
+    if getattr(graph, "is_csr", False):
+        return _bfs_tree_csr(graph, start_node, direction_optimizing)
+
+    distances = {start_node: 0}
+    parents = {start_node: start_node}
+    order = []
+    queue = deque([start_node])
+
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for neighbor in graph.neighbors(node):
+            if neighbor not in distances:
+                distances[neighbor] = distances[node] + 1
+                parents[neighbor] = node
+                queue.append(neighbor)
+
+    return order, distances, parents
+
+
+def _bfs_tree_csr(graph, start_node, direction_optimizing):
+    indptr, indices = graph.indptr, graph.indices
+    n = graph.number_of_nodes()
+    start = graph.id_of(start_node)
+
+    visited = bytearray(n)
+    visited[start] = 1
+    distance = [-1] * n
+    distance[start] = 0
+    parent = [-1] * n
+    parent[start] = start
+
+    order = [start]
+    frontier = [start]
+    level = 0
+    unexplored_edges = len(indices)
+    unvisited = None
+    bottom_up = False
+
+    while frontier:
+        level += 1
+        if direction_optimizing:
+            frontier_edges = sum(indptr[u + 1] - indptr[u] for u in frontier)
+            unexplored_edges -= frontier_edges
+            if not bottom_up and frontier_edges * ALPHA > unexplored_edges:
+                bottom_up = True
+            elif bottom_up and len(frontier) * BETA < n:
+                bottom_up = False
+
+        next_frontier = []
+        if bottom_up:
+            # every unvisited node looks for any parent in the frontier and stops at the first one
+            in_frontier = bytearray(n)
+            for u in frontier:
+                in_frontier[u] = 1
+            if unvisited is None:
+                unvisited = [v for v in range(n) if not visited[v]]
+            still_unvisited = []
+            for v in unvisited:
+                if visited[v]:
+                    continue
+                for u in indices[indptr[v]:indptr[v + 1]]:
+                    if in_frontier[u]:
+                        visited[v] = 1
+                        distance[v] = level
+                        parent[v] = u
+                        next_frontier.append(v)
+                        break
+                else:
+                    still_unvisited.append(v)
+            unvisited = still_unvisited
+        else:
+            for u in frontier:
+                for v in indices[indptr[u]:indptr[u + 1]]:
+                    if not visited[v]:
+                        visited[v] = 1
+                        distance[v] = level
+                        parent[v] = u
+                        next_frontier.append(v)
+
+        order.extend(next_frontier)
+        frontier = next_frontier
+
+    labels = graph.labels
+    return (
+        [labels[v] for v in order],
+        {labels[v]: distance[v] for v in order},
+        {labels[v]: labels[parent[v]] for v in order},
+    )
@@ -1,22 +1,50 @@
 import networkx as nx
-import matplotlib.pyplot as plt
-import random
-import time
 
 
 def dfs(graph: nx.Graph, start_node: int) -> list:
+    if getattr(graph, "is_csr", False):
+        return _dfs_csr(graph, start_node)
 
-    visited = set()
-    stack = [start_node]
-    dfs_order = []
+    # one neighbour iterator per stack frame, resumed where it stopped, so no
+    # neighbour list is copied and every node is pushed once
+    visited = {start_node}
+    stack = [iter(graph.adj[start_node])]
+    dfs_order = [start_node]
 
     while stack:
-        node = stack.pop()
-        if node not in visited:
-            visited.add(node)
-            dfs_order.append(node)
-            # Add neighbors to stack in reverse order for correct DFS order
-            stack.extend(reversed(list(graph.neighbors(node))))
+        for neighbor in stack[-1]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                dfs_order.append(neighbor)
+                stack.append(iter(graph.adj[neighbor]))
+                break
+        else:
+            stack.pop()
 
     return dfs_order
 
+
+def _dfs_csr(graph, start_node) -> list:
+    # the same frame iterators as the networkx path, over memoryview slices that share
+    # the indices buffer, so no neighbour list is copied
+    indptr, indices = graph.indptr, memoryview(graph.indices)
+    start = graph.id_of(start_node)
+
+    visited = bytearray(graph.number_of_nodes())
+    visited[start] = 1
+    stack = [iter(indices[indptr[start]:indptr[start + 1]])]
+    order = [start]
+
+    while stack:
+        for neighbor in stack[-1]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                order.append(neighbor)
+                stack.append(iter(indices[indptr[neighbor]:indptr[neighbor + 1]]))
+                break
+        else:
+            stack.pop()
+
+    labels = graph.labels
+    return [labels[node] for node in order]
+
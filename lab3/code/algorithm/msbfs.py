@@ -0,0 +1,128 @@
+import numpy as np
+
+from algorithm.bfs import ALPHA
+from common.csr import CSRGraph
+
+### many sources in one level-synchronous sweep (MS-BFS, Then et al.)
+#
+# bit i of a node's uint64 word says the node is in source i's frontier, so one
+# pass over the edges advances up to 64 traversals at once, a level costs a few
+# numpy calls over the frontier's edges (top-down) or over all edges (bottom-up),
+# switching at the ALPHA threshold of the lab3 BFS
+#
+# results are indexed by CSR node id, graph.labels maps them back to labels
+
+MAX_SOURCES = 64
+
+# owner of a node no facility has reached yet
+_NO_OWNER = np.iinfo(np.int64).max
+
+
+def _arrays(graph):
+    if not getattr(graph, "is_csr", False):
+        graph = CSRGraph.from_networkx(graph)
+    indptr, indices, _ = graph.as_numpy()
+    return graph, indptr, indices, np.diff(indptr)
+
+
+def _pull(indptr, indices, degree, values, frontier, ufunc, identity):
+    # ufunc-reduction of values[u] over the frontier neighbours u of every node,
+    # values outside the frontier must already be identity
+    n = len(degree)
+    if degree[frontier].sum() * ALPHA > len(indices):
+        # bottom-up, every node reduces over all of its neighbours in one reduceat
+        reached = np.full(n, identity, dtype=values.dtype)
+        has_edges = degree > 0
+        reached[has_edges] = ufunc.reduceat(values[indices], indptr[:-1][has_edges])
+        return reached
+
+    # top-down, only the edges leaving the frontier are touched
+    counts = degree[frontier]
+    offsets = np.repeat(indptr[:-1][frontier] - (np.cumsum(counts) - counts), counts)
+    positions = offsets + np.arange(counts.sum())
+    reached = np.full(n, identity, dtype=values.dtype)
+    ufunc.at(reached, indices[positions], np.repeat(values[frontier], counts))
+    return reached
+
+
+def ms_bfs(graph, sources, depth_limit: int = None) -> np.ndarray:
+    """Return a (len(sources), n) int32 array of hop distances, -1 where unreached.
+
+    Runs up to MAX_SOURCES breadth-first searches in one sweep, nodes beyond
+    depth_limit stay unreached.
+    """
+    if not 1 <= len(sources) <= MAX_SOURCES:
+        raise ValueError(f"Expected between 1 and {MAX_SOURCES} sources, got {len(sources)}.")
+
+    graph, indptr, indices, degree = _arrays(graph)
+    n, k = len(degree), len(sources)
+    ids = np.array([graph.id_of(source) for source in sources], dtype=np.int64)
+
+    seen = np.zeros(n, dtype=np.uint64)
+    # the same node may be listed as several sources
+    np.bitwise_or.at(seen, ids, np.uint64(1) << np.arange(k, dtype=np.uint64))
+    visit = seen.copy()
+
+    distances = np.full((k, n), -1, dtype=np.int32)
+    distances[np.arange(k), ids] = 0
+
+    level = 0
+    frontier = np.flatnonzero(visit)
+    while len(frontier) and level != depth_limit:
+        level += 1
+        visit = _pull(indptr, indices, degree, visit, frontier, np.bitwise_or, 0)
+        visit &= ~seen
+        seen |= visit
+
+        frontier = np.flatnonzero(visit)
+        # one row per newly reached node, one column per source bit
+        bits = np.unpackbits(visit[frontier].view(np.uint8), bitorder="little").reshape(-1, 64)
+        rows, columns = np.nonzero(bits[:, :k])
+        distances[columns, frontier[rows]] = level
+
+    return distances
+
+
+def batched_bfs(graph, sources, depth_limit: int = None):
+    """Yield (batch, distances) for the sources in batches of MAX_SOURCES, see ms_bfs."""
+    if not getattr(graph, "is_csr", False):
+        # converted once here instead of once per batch
+        graph = CSRGraph.from_networkx(graph)
+    sources = list(sources)
+    for start in range(0, len(sources), MAX_SOURCES):
+        batch = sources[start:start + MAX_SOURCES]
+        yield batch, ms_bfs(graph, batch, depth_limit)
+
+
+def nearest_facility(graph, facilities):
+    """Return (distance, nearest) int arrays, the hops to the closest facility and its index.
+
+    One breadth-first sweep started from all facilities at once, ties go to the
+    facility listed first, unreached nodes get -1 in both arrays.
+    """
+    if not len(facilities):
+        raise ValueError("Expected at least one facility.")
+
+    graph, indptr, indices, degree = _arrays(graph)
+    n = len(degree)
+    ids = np.array([graph.id_of(facility) for facility in facilities], dtype=np.int64)
+
+    owner = np.full(n, _NO_OWNER, dtype=np.int64)
+    np.minimum.at(owner, ids, np.arange(len(ids)))
+    distance = np.full(n, -1, dtype=np.int32)
+    distance[ids] = 0
+
+    level = 0
+    frontier = np.flatnonzero(distance == 0)
+    while len(frontier):
+        level += 1
+        values = np.full(n, _NO_OWNER, dtype=np.int64)
+        values[frontier] = owner[frontier]
+        reached = _pull(indptr, indices, degree, values, frontier, np.minimum, _NO_OWNER)
+
+        frontier = np.flatnonzero((reached != _NO_OWNER) & (distance < 0))
+        owner[frontier] = reached[frontier]
+        distance[frontier] = level
+
+    owner[owner == _NO_OWNER] = -1
+    return distance, owner
@@ -0,0 +1,173 @@
+from collections import deque
+from itertools import islice
+
+### lazy traversals, nothing is visited before the caller asks for the next item
+#
+# every generator works on an nx.Graph or a CSRGraph and yields node labels, a caller
+# that stops iterating (break, islice, next) pays only for what it has consumed
+#
+# events are (event, node, parent, depth) tuples, the source is its own parent
+
+DISCOVER = "discover"
+FINISH = "finish"
+
+
+class _Marks(bytearray):
+    # visited flags over CSR ids with the interface of the set used for nx graphs
+    __contains__ = bytearray.__getitem__
+
+    def add(self, node):
+        self[node] = 1
+
+
+def _walker(graph):
+    # (id of a label, neighbour iterator of an id, label of an id, empty visited marks)
+    if getattr(graph, "is_csr", False):
+        indptr, indices = graph.indptr, memoryview(graph.indices)
+        # a memoryview slice shares the buffer, no neighbour list is copied
+        return (
+            graph.id_of,
+            lambda node: iter(indices[indptr[node]:indptr[node + 1]]),
+            graph.labels.__getitem__,
+            _Marks(graph.number_of_nodes()),
+        )
+    return _same, lambda node: iter(graph.adj[node]), _same, set()
+
+
+def _same(node):
+    return node
+
+
+### DFS, a stack of (node, neighbour iterator) frames
+
+def dfs_events(graph, source, depth_limit: int = None):
+    """Yield DISCOVER when a node is entered and FINISH once all its neighbours are done.
+
+    Nodes at depth_limit are discovered but not expanded. A node first reached along a
+    long path is not revisited through a shorter one, as in networkx.
+    """
+    to_id, neighbors, label, visited = _walker(graph)
+    start = to_id(source)
+    visited.add(start)
+    yield DISCOVER, source, source, 0
+
+    stack = [(start, neighbors(start))]
+    while stack:
+        node, children = stack[-1]
+        depth = len(stack) - 1
+        entered = False
+        if depth_limit is None or depth < depth_limit:
+            # resumes the frame's iterator where it stopped, at most one child per step
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    yield DISCOVER, label(child), label(node), depth + 1
+                    stack.append((child, neighbors(child)))
+                    entered = True
+                    break
+        if not entered:
+            stack.pop()
+            yield FINISH, label(node), label(stack[-1][0] if stack else node), depth
+
+
+def dfs_nodes(graph, source, depth_limit: int = None):
+    """Yield the nodes in DFS preorder, the order of dfs()."""
+    for event, node, _, _ in dfs_events(graph, source, depth_limit):
+        if event is DISCOVER:
+            yield node
+
+
+def dfs_edges(graph, source, depth_limit: int = None):
+    """Yield the (parent, child) edges of the DFS tree as they are taken."""
+    events = dfs_events(graph, source, depth_limit)
+    next(events)
+    for event, node, parent, _ in events:
+        if event is DISCOVER:
+            yield parent, node
+
+
+### BFS, a queue of (node, parent, depth) with nodes marked when they are queued
+
+def bfs_events(graph, source, depth_limit: int = None):
+    """Yield DISCOVER when a node is queued and FINISH once its neighbours are scanned."""
+    to_id, neighbors, label, visited = _walker(graph)
+    start = to_id(source)
+    visited.add(start)
+    yield DISCOVER, source, source, 0
+
+    queue = deque([(start, start, 0)])
+    while queue:
+        node, parent, depth = queue.popleft()
+        if depth_limit is None or depth < depth_limit:
+            for child in neighbors(node):
+                if child not in visited:
+                    visited.add(child)
+                    yield DISCOVER, label(child), label(node), depth + 1
+                    queue.append((child, node, depth + 1))
+        yield FINISH, label(node), label(parent), depth
+
+
+def bfs_nodes(graph, source, depth_limit: int = None):
+    """Yield the nodes in BFS order, the order of bfs()."""
+    for event, node, _, _ in bfs_events(graph, source, depth_limit):
+        if event is DISCOVER:
+            yield node
+
+
+def bfs_edges(graph, source, depth_limit: int = None):
+    """Yield the (parent, child) edges of the BFS tree as they are found."""
+    events = bfs_events(graph, source, depth_limit)
+    next(events)
+    for event, node, parent, _ in events:
+        if event is DISCOVER:
+            yield parent, node
+
+
+TRAVERSALS = {
+    "dfs": dfs_events,
+    "bfs": bfs_events,
+}
+
+
+### early termination
+
+def traverse(graph, source, method: str = "bfs", target=None, depth_limit: int = None, max_nodes: int = None):
+    """Yield nodes in method order and stop after the target or after max_nodes nodes."""
+    if method not in TRAVERSALS:
+        raise ValueError(f"Unknown method '{method}', expected one of {tuple(TRAVERSALS)}.")
+
+    nodes = (node for event, node, _, _ in TRAVERSALS[method](graph, source, depth_limit) if event is DISCOVER)
+    for node in islice(nodes, max_nodes):
+        yield node
+        if node == target:
+            return
+
+
+def find_path(graph, source, target, method: str = "bfs", depth_limit: int = None, max_nodes: int = None):
+    """Return the tree path from source to target, or None if it was not reached.
+
+    The traversal stops as soon as target is discovered, with method="bfs" the path
+    has the fewest edges.
+    """
+    if method not in TRAVERSALS:
+        raise ValueError(f"Unknown method '{method}', expected one of {tuple(TRAVERSALS)}.")
+
+    parents = {}
+    discovered = 0
+    for event, node, parent, _ in TRAVERSALS[method](graph, source, depth_limit):
+        if event is not DISCOVER:
+            continue
+        parents[node] = parent
+        discovered += 1
+        if node == target:
+            break
+        if max_nodes is not None and discovered >= max_nodes:
+            return None
+    else:
+        return None
+
+    path = [target]
+    while path[-1] != source:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
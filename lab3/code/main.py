@@ -1,82 +1,111 @@
-import networkx as nx
-import matplotlib.pyplot as plt
 import random
-import time
 import numpy as np
+import os
+import sys
 
-from algorithm.dfs import dfs
-from algorithm.bfs import bfs
-
-def generate_connected_weighted_graph(num_nodes: int, num_edges: int, weight_range=(1, 10)) -> nx.Graph:
-    if num_edges < num_nodes - 1:
-        raise ValueError("Number of edges must be at least (num_nodes - 1) for connectivity.")
-    if num_edges > num_nodes * (num_nodes - 1) // 2:
-        raise ValueError("Too many edges for the number of nodes.")
-
-    G = nx.complete_graph(num_nodes)
-    edge_weights = {(u, v): random.random() for u, v in G.edges()}
-    nx.set_edge_attributes(G, edge_weights, 'weight')
-    T = nx.minimum_spanning_tree(G)
-    G = T.copy()
-
-    remaining_edges = num_edges - (num_nodes - 1)
-    all_possible_edges = list(nx.non_edges(G))
-
-    if remaining_edges > 0 and all_possible_edges:
-        selected_edges = random.sample(all_possible_edges, min(remaining_edges, len(all_possible_edges)))
-        G.add_edges_from(selected_edges)
-
-    mapping = {i: f'v{i+1}' for i in range(num_nodes)}
-    G = nx.relabel_nodes(G, mapping)
-
-    for u, v in G.edges():
-        G[u][v]['weight'] = random.randint(*weight_range)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
 
-    return G
+from common.benchmark import measure
+from common.results import ResultStore
+from common.graph_gen import generate_connected_weighted_graph, random_connected_edges
+from common.csr import CSRGraph
+from algorithm.dfs import dfs
+from algorithm.bfs import bfs, bfs_tree
+from algorithm.msbfs import MAX_SOURCES, batched_bfs, nearest_facility
 
 def run_traversal_benchmark(algorithm, graph, start_node):
-    start_time = time.perf_counter()
-    algorithm(graph, start_node)
-    return time.perf_counter() - start_time
+    return measure(algorithm, graph, start_node).median
 
-def benchmark_traversals(num_nodes, num_edges, repetitions):
+def benchmark_traversals(num_nodes, num_edges, repetitions, run=None, seed=None):
     dfs_times = []
     bfs_times = []
+    # the same traversals on the array-backed CSR copy of every graph
+    dfs_csr_times = []
+    bfs_csr_times = []
 
     for _ in range(repetitions):
         G = generate_connected_weighted_graph(num_nodes, num_edges)
+        C = CSRGraph.from_networkx(G)
         start = list(G.nodes())[0]
         dfs_times.append(run_traversal_benchmark(dfs, G, start))
         bfs_times.append(run_traversal_benchmark(bfs, G, start))
+        dfs_csr_times.append(run_traversal_benchmark(dfs, C, start))
+        bfs_csr_times.append(run_traversal_benchmark(bfs, C, start))
+
+    if run is not None:
+        family = f"edges={num_edges}"
+        run.record("dfs", family, num_nodes, dfs_times, seed=seed)
+        run.record("bfs", family, num_nodes, bfs_times, seed=seed)
+        run.record("dfs_csr", family, num_nodes, dfs_csr_times, seed=seed)
+        run.record("bfs_csr", family, num_nodes, bfs_csr_times, seed=seed)
 
     return (np.mean(dfs_times), np.mean(bfs_times))
 
+def benchmark_bfs_engine(sizes, average_degree, run=None, seed=None):
+    # level-synchronous BFS with distances and parents on large CSR graphs, top-down only
+    # against direction-optimising
+    for n in sizes:
+        u, v, weights = random_connected_edges(n, n * average_degree // 2, seed=seed)
+        C = CSRGraph.from_edges(u, v, weights, n)
+        family = f"degree={average_degree}"
+
+        top_down = measure(bfs_tree, C, 0, warmup=0, min_repeat=1)
+        optimizing = measure(bfs_tree, C, 0, True, warmup=0, min_repeat=1)
+        print(f"{n:>10} nodes  top-down {top_down.median:.3f}s  direction-optimising {optimizing.median:.3f}s")
+
+        if run is not None:
+            run.record("bfs_tree", family, n, top_down, seed=seed)
+            run.record("bfs_tree_direction_optimizing", family, n, optimizing, seed=seed)
+
+def _all_batches(graph, sources):
+    for _ in batched_bfs(graph, sources):
+        pass
+
+def _one_by_one(graph, sources):
+    for source in sources:
+        bfs_tree(graph, source)
+
+def benchmark_multi_source(sizes, average_degree, num_sources, run=None, seed=None):
+    # throughput in traversed edges per second (TEPS), every search of a connected
+    # graph traverses all of its edges, the nearest-facility sweep counts as one search
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        u, v, weights = random_connected_edges(n, n * average_degree // 2, seed=seed)
+        C = CSRGraph.from_edges(u, v, weights, n)
+        family = f"degree={average_degree}"
+        sources = rng.integers(0, n, num_sources).tolist()
+        edges = C.number_of_edges()
+
+        results = {
+            "bfs_per_source": (measure(_one_by_one, C, sources, warmup=0, min_repeat=1), num_sources),
+            "ms_bfs": (measure(_all_batches, C, sources, warmup=0, min_repeat=1), num_sources),
+            "nearest_facility": (measure(nearest_facility, C, sources, warmup=0, min_repeat=1), 1),
+        }
+        for name, (timing, searches) in results.items():
+            teps = searches * edges / timing.median
+            print(f"{n:>10} nodes  {name:<18} {timing.median:.3f}s  {teps / 1e6:.1f} MTEPS")
+            if run is not None:
+                run.record(name, family, n, timing, seed=seed, sources=num_sources, teps=teps)
+
 def main():
-    random.seed(42)
-    np.random.seed(42)
+    seed = 42
+    random.seed(seed)
+    np.random.seed(seed)
+    run = ResultStore().start_run("lab3")
 
     nodes = [10, 50, 100, 200, 300, 600, 1000]
     edge_density = 1.5
     repetitions = 5
 
-    dfs_results = []
-    bfs_results = []
-
     for n in nodes:
         e = int(n * edge_density)
-        dfs_time, bfs_time = benchmark_traversals(n, e, repetitions)
-        dfs_results.append(dfs_time)
-        bfs_results.append(bfs_time)
-
-    plt.plot(nodes, dfs_results, label='DFS', marker='o')
-    plt.plot(nodes, bfs_results, label='BFS', marker='s')
-    plt.xlabel("Number of Nodes")
-    plt.ylabel("Time (s)")
-    plt.title("DFS vs BFS Traversal Time")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig("traversal_benchmark.png", dpi=300)
+        benchmark_traversals(n, e, repetitions, run, seed)
+
+    benchmark_bfs_engine([10**4, 10**5, 10**6], 16, run, seed)
+    benchmark_multi_source([10**4, 10**5], 16, MAX_SOURCES, run, seed)
+
+    # only raw results here, the charts are drawn by the report stage
+    print(f"timings stored as run {run.run_id}, render them with: python -m common.report --run {run.run_id}")
 
 if __name__ == "__main__":
     main()
@@ -2,6 +2,9 @@ import heapq
 import networkx as nx
 
 def dijkstra(graph: nx.Graph, start_node: str) -> dict:
+    if getattr(graph, "is_csr", False):
+        return _dijkstra_csr(graph, start_node)
+
     distances = {node: float('inf') for node in graph.nodes}
     distances[start_node] = 0
     pq = [(0, start_node)]
@@ -19,3 +22,27 @@ def dijkstra(graph: nx.Graph, start_node: str) -> dict:
                 heapq.heappush(pq, (distance, neighbor))
 
     return distances
+
+
+def _dijkstra_csr(graph, start_node) -> dict:
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    start = graph.id_of(start_node)
+
+    distances = [float('inf')] * graph.number_of_nodes()
+    distances[start] = 0
+    pq = [(0, start)]
+
+    while pq:
+        current_distance, current_node = heapq.heappop(pq)
+        if current_distance > distances[current_node]:
+            continue
+
+        low, high = indptr[current_node], indptr[current_node + 1]
+        for neighbor, weight in zip(indices[low:high], weights[low:high]):
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                heapq.heappush(pq, (distance, neighbor))
+
+    return dict(zip(graph.labels, distances))
+
@@ -1,6 +1,10 @@
 import networkx as nx
+import numpy as np
 
 def floyd_warshall(graph: nx.Graph) -> dict:
+    if getattr(graph, "is_csr", False):
+        return _floyd_warshall_csr(graph)
+
     nodes = list(graph.nodes)
     dist = {u: {v: float('inf') for v in nodes} for u in nodes}
     
@@ -20,3 +24,20 @@ def floyd_warshall(graph: nx.Graph) -> dict:
     
     return dist
 
+
+def _floyd_warshall_csr(graph) -> dict:
+    n = graph.number_of_nodes()
+    u, v, weights = graph.edge_arrays()
+
+    dist = np.full((n, n), np.inf)
+    dist[u, v] = weights
+    dist[v, u] = weights
+    np.fill_diagonal(dist, 0)
+
+    # the two inner loops become one whole-matrix minimum per k
+    for k in range(n):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+
+    labels = graph.labels
+    return {labels[i]: dict(zip(labels, row)) for i, row in enumerate(dist.tolist())}
+
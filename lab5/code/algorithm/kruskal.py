@@ -1,7 +1,11 @@
 import networkx as nx
+import numpy as np
 
 
 def min_span_tree_kruskal(G: nx.Graph) -> nx.Graph:
+    if getattr(G, "is_csr", False):
+        return _min_span_tree_kruskal_csr(G)
+
     if not G.nodes:
         return nx.Graph()
 
@@ -37,3 +41,37 @@ def min_span_tree_kruskal(G: nx.Graph) -> nx.Graph:
             mst.add_edge(u, v, weight=data['weight'])
 
     return mst
+
+
+def _min_span_tree_kruskal_csr(G):
+    # the edges are sorted by weight in one numpy call, the union-find runs over int ids
+    n = G.number_of_nodes()
+    u, v, weights = G.edge_arrays()
+    order = np.argsort(weights, kind="stable")
+
+    parent = list(range(n))
+    rank = [0] * n
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:  # Path compression
+            parent[x], x = root, parent[x]
+        return root
+
+    tree = []
+    for i, a, b in zip(order.tolist(), u[order].tolist(), v[order].tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            if rank[root_a] < rank[root_b]:
+                root_a, root_b = root_b, root_a
+            parent[root_b] = root_a
+            if rank[root_a] == rank[root_b]:
+                rank[root_a] += 1
+            tree.append(i)
+            if len(tree) == n - 1:
+                break
+
+    tree = np.array(tree, dtype=np.int64)
+    return type(G).from_edges(u[tree], v[tree], weights[tree], n, G.labels)
@@ -1,8 +1,12 @@
 import networkx as nx
 import heapq
+import numpy as np
 
 
 def min_span_tree_prim(G: nx.Graph) -> nx.Graph:
+    if getattr(G, "is_csr", False):
+        return _min_span_tree_prim_csr(G)
+
     if not G.nodes:
         return nx.Graph()
 
@@ -31,3 +35,33 @@ def min_span_tree_prim(G: nx.Graph) -> nx.Graph:
                     heapq.heappush(min_heap, (G[v][neighbor]['weight'], v, neighbor))
 
     return mst
+
+
+def _min_span_tree_prim_csr(G):
+    # same lazy heap over int ids, the tree comes back as a CSR graph with the same labels
+    indptr, indices, weights = G.indptr, G.indices, G.weights
+    n = G.number_of_nodes()
+    tree_u, tree_v, tree_w = [], [], []
+    if n:
+        visited = bytearray(n)
+        visited[0] = 1
+        count = 1
+        min_heap = [(w, 0, v) for v, w in zip(indices[indptr[0]:indptr[1]], weights[indptr[0]:indptr[1]])]
+        heapq.heapify(min_heap)
+
+        while min_heap and count < n:
+            weight, u, v = heapq.heappop(min_heap)
+
+            if not visited[v]:
+                visited[v] = 1
+                count += 1
+                tree_u.append(u)
+                tree_v.append(v)
+                tree_w.append(weight)
+
+                low, high = indptr[v], indptr[v + 1]
+                for neighbor, w in zip(indices[low:high], weights[low:high]):
+                    if not visited[neighbor]:
+                        heapq.heappush(min_heap, (w, v, neighbor))
+
+    return type(G).from_edges(tree_u, tree_v, np.array(tree_w, dtype=np.dtype(weights.typecode)), n, G.labels)
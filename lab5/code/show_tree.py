@@ -1,4 +1,6 @@
 import networkx as nx
+import matplotlib
+matplotlib.use("Agg")  # the figures are only saved, never shown
 import matplotlib.pyplot as plt
 import random
 import time